@@ -0,0 +1,249 @@
+"""
+Read-only HTTP JSON API over the client data store.
+
+    python api_server.py --port 8765
+
+Endpoints (all GET):
+    /organizations                                   paginated list
+    /organizations/<id>                              one record
+    /organizations/<id>/brands                       brands of a record
+    /organizations/<id>/brands/<brand>/<section>     one report section
+                                                     (competitor_analysis, google_trends, ...)
+
+Query parameters:
+    limit, offset      pagination of /organizations (default 50, max 500)
+    type               filter /organizations by record type
+    fields             comma separated top-level fields to return
+
+Every response carries a strong ETag derived from the ids and versions of the
+records it contains. A request whose If-None-Match matches gets a 304 without
+the body being built or serialized again.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from utils import data_manager
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+BODY_CACHE_SIZE = 2048
+
+# Fields returned for list items when no ?fields= is given
+SUMMARY_FIELDS = ["id", "organization", "type", "executive_name", "onboard_date", "presentation_date", "version"]
+
+
+class Snapshot:
+    """
+    The store as last read from disk, reloaded whenever the file changes.
+    Keeps records in stored order plus an id index for point lookups.
+    """
+
+    def __init__(self):
+        self.signature = None
+        self.records = []
+        self.by_id = {}
+        self.lock = threading.Lock()
+
+    def current(self):
+        data_manager.ensure_data_file()
+        st = os.stat(data_manager.DATA_FILE)
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature != self.signature:
+            with self.lock:
+                if signature != self.signature:
+                    records = list(data_manager.iter_raw())
+                    self.by_id = {r.get("id"): r for r in records}
+                    self.records = records
+                    self.signature = signature
+        return self
+
+
+class BodyCache:
+    """Serialized response bodies keyed by ETag (LRU)."""
+
+    def __init__(self, size=BODY_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, etag):
+        with self.lock:
+            body = self.entries.get(etag)
+            if body is not None:
+                self.entries.move_to_end(etag)
+            return body
+
+    def put(self, etag, body):
+        with self.lock:
+            self.entries[etag] = body
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+
+def _etag(*parts):
+    digest = hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def _select(record, fields):
+    if not fields:
+        return record
+    return {f: record.get(f) for f in fields}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ClientsAPI/1.0"
+    # Headers and body are written separately; without this, keep-alive
+    # clients stall on delayed ACKs for ~40ms per request
+    disable_nagle_algorithm = True
+
+    snapshot = Snapshot()
+    cache = BodyCache()
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        fields = [f for f in query.get("fields", [""])[0].split(",") if f]
+
+        if not parts or parts[0] != "organizations":
+            return self._error(404, "Not found")
+        snap = self.snapshot.current()
+
+        if len(parts) == 1:
+            return self._list(snap, query, fields)
+
+        record = snap.by_id.get(parts[1])
+        if record is None:
+            return self._error(404, f"No record with id {parts[1]}")
+        version = record.get("version", 1)
+
+        if len(parts) == 2:
+            etag = _etag("record", record["id"], version, fields)
+            return self._respond(etag, lambda: _select(record, fields))
+
+        if parts[2] != "brands":
+            return self._error(404, "Not found")
+
+        if len(parts) == 3:
+            etag = _etag("brands", record["id"], version, fields)
+            return self._respond(etag, lambda: [_select(b, fields) for b in record.get("brands", [])])
+
+        brand = next((b for b in record.get("brands", []) if b.get("name") == parts[3]), None)
+        if brand is None:
+            return self._error(404, f"No brand {parts[3]}")
+        if len(parts) == 4:
+            etag = _etag("brand", record["id"], version, parts[3], fields)
+            return self._respond(etag, lambda: _select(brand, fields))
+
+        if len(parts) == 5:
+            data = brand.get("data", {})
+            if parts[4] not in data:
+                return self._error(404, f"No section {parts[4]}")
+            etag = _etag("section", record["id"], version, parts[3], parts[4])
+            return self._respond(etag, lambda: data[parts[4]])
+
+        return self._error(404, "Not found")
+
+    def _list(self, snap, query, fields):
+        try:
+            limit = min(int(query.get("limit", [DEFAULT_LIMIT])[0]), MAX_LIMIT)
+            offset = max(int(query.get("offset", [0])[0]), 0)
+        except ValueError:
+            return self._error(400, "limit and offset must be integers")
+        rec_type = query.get("type", [None])[0]
+
+        records = snap.records
+        if rec_type:
+            records = [r for r in records if r.get("type") == rec_type]
+        page = records[offset:offset + limit]
+        fields = fields or SUMMARY_FIELDS
+
+        etag = _etag("list", offset, limit, rec_type, fields, len(records),
+                     *(f"{r.get('id')}:{r.get('version', 1)}" for r in page))
+
+        def build():
+            next_offset = offset + limit if offset + limit < len(records) else None
+            return {
+                "items": [_select(r, fields) for r in page],
+                "total": len(records),
+                "limit": limit,
+                "offset": offset,
+                "next_offset": next_offset,
+            }
+
+        return self._respond(etag, build)
+
+    def _respond(self, etag, build):
+        inm = self.headers.get("If-None-Match")
+        if inm and (inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = self.cache.get(etag)
+        if body is None:
+            body = json.dumps(build(), separators=(",", ":")).encode("utf-8")
+            self.cache.put(etag, body)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(host="127.0.0.1", port=8765, verbose=False):
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data-dir", help="data directory (default: $CLIENTS_DATA_DIR or ./data)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+    if args.data_dir:
+        data_manager.configure(args.data_dir)
+
+    server = make_server(args.host, args.port, args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
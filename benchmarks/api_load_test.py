@@ -0,0 +1,101 @@
+"""
+Load test for api_server.py against a local instance on a synthetic store.
+
+Each worker keeps one HTTP/1.1 connection open and requests list pages and
+single records for a fixed time, first unconditionally (200 + body) and then
+with If-None-Match set to the ETag seen earlier (304, no body).
+
+    python benchmarks/api_load_test.py --records 5000 --workers 8 --seconds 5
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import api_server
+from benchmarks.synthetic import make_portfolio
+from utils import data_manager
+
+
+def worker(port, paths, seconds, conditional, etags, results):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    rng = random.Random()
+    deadline = time.perf_counter() + seconds
+    latencies = []
+    statuses = {}
+    while time.perf_counter() < deadline:
+        path = rng.choice(paths)
+        headers = {"If-None-Match": etags[path]} if conditional and path in etags else {}
+        start = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        latencies.append(time.perf_counter() - start)
+        statuses[resp.status] = statuses.get(resp.status, 0) + 1
+        if not conditional:
+            etags[path] = resp.getheader("ETag")
+    conn.close()
+    results.append((latencies, statuses))
+
+
+def run(port, paths, workers, seconds, conditional, etags):
+    results = []
+    threads = [threading.Thread(target=worker, args=(port, paths, seconds, conditional, etags, results))
+               for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies = sorted(l for r in results for l in r[0])
+    statuses = {}
+    for _, s in results:
+        for code, n in s.items():
+            statuses[code] = statuses.get(code, 0) + n
+    return len(latencies) / seconds, latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager.configure(tmp)
+        records = make_portfolio(args.records)
+        with open(data_manager.DATA_FILE, "w") as f:
+            json.dump(records, f)
+
+        server = api_server.make_server(port=0)
+        port = server.server_port
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        paths = [f"/organizations?limit=50&offset={o}" for o in range(0, min(args.records, 2500), 50)]
+        paths += [f"/organizations/{r['id']}" for r in records[:500]]
+        paths += [f"/organizations/{r['id']}/brands/{quote(r['brands'][0]['name'])}/competitor_analysis"
+                  for r in records[:200] if "competitor_analysis" in r["brands"][0]["data"]]
+
+        etags = {}
+        print(f"{args.records} records, {len(paths)} distinct URLs, {args.workers} workers, {args.seconds}s per run")
+        for label, conditional in [("unconditional", False), ("If-None-Match", True)]:
+            rps, lat, statuses = run(port, paths, args.workers, args.seconds, conditional, etags)
+            p50 = lat[len(lat) // 2] * 1000
+            p99 = lat[int(len(lat) * 0.99)] * 1000
+            print(f"{label:<15}{rps:>9.0f} req/s   p50 {p50:.2f}ms   p99 {p99:.2f}ms   {statuses}")
+
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
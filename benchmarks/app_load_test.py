@@ -0,0 +1,264 @@
+"""
+Concurrent-session load test that drives the real Streamlit pages.
+
+Each simulated user is a Streamlit AppTest session running clients.py
+against one shared temporary data directory. AppTest swaps process-global
+Streamlit state on every run, so sessions cannot share a process; each runs
+in a worker process instead (which makes races on the store, if anything,
+more likely than under one Streamlit server). Sessions follow scripted flows:
+
+  onboard  fill in "Onboard Client" for a new organization and save
+  update   add a brand to a busy organization via "Update Client"
+  manage   edit the Google Trends link of a brand via "Manage Clients"
+
+update and manage sessions deliberately target a few "hot" organizations so
+they contend for the same records. At the end the store is checked for every
+write the sessions reported as successful; missing ones are lost updates.
+Saves the page refused because the record changed underneath them (the user
+is told and can redo the edit) are counted as rejected, not lost.
+
+    python benchmarks/app_load_test.py --sessions 30 --concurrency 30
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_portfolio
+from utils import data_manager
+from utils.models import decode_records
+
+SCRIPT = os.path.join(ROOT, "clients.py")
+
+
+class Recorder:
+    """Latencies and successful writes of one session, sent back to the parent."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.saves = 0
+        self.rejected = 0
+        self.errors = []
+        self.expected = {"orgs": [], "brands": [], "links": []}
+
+    def saved(self, at):
+        """Counts a save click: True if it was stored, False if refused or crashed."""
+        if at.exception:
+            return False
+        if any("Someone else saved" in e.value for e in at.error):
+            self.rejected += 1
+            return False
+        self.saves += 1
+        return True
+
+    def step(self, flow, name, action):
+        start = time.perf_counter()
+        at = action()
+        self.latencies[f"{flow}: {name}"].append(time.perf_counter() - start)
+        if at.exception:
+            self.errors.append(f"{flow}: {name}: {at.exception[0].value}")
+        return at
+
+
+def _button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+
+def onboard_session(rec, i):
+    from streamlit.testing.v1 import AppTest
+
+    org, brand = f"Load Org {i:04d}", f"Load Brand {i:04d}"
+    at = AppTest.from_file(SCRIPT, default_timeout=120)
+    rec.step("onboard", "open app", at.run)
+    rec.step("onboard", "executive", at.text_input(key="onboard_exec_name").input(f"Exec {i}").run)
+    rec.step("onboard", "organization", at.text_input(key="onboard_org_name").input(org).run)
+    rec.step("onboard", "brand", at.text_input(key="onboard_brand_0").input(brand).run)
+    rec.step("onboard", "reports", at.multiselect[0].set_value(["Google Trends", "Meta Platform"]).run)
+    rec.step("onboard", "trends link", at.text_input(key=f"onboard_{brand}_gtrends_link").input(f"https://t/{i}").run)
+    at = rec.step("onboard", "save", _button(at, "Save Data").click().run)
+    if rec.saved(at):
+        rec.expected["orgs"].append(org)
+
+
+def update_session(rec, i, org):
+    from streamlit.testing.v1 import AppTest
+
+    brand = f"Added Brand {i:04d}"
+    at = AppTest.from_file(SCRIPT, default_timeout=120)
+    rec.step("update", "open app", at.run)
+    rec.step("update", "open page", at.sidebar.radio[0].set_value("Update Client").run)
+    rec.step("update", "search org", at.text_input(key="update_org_search").input(org).run)
+    rec.step("update", "select org", at.selectbox(key="update_org_select").set_value(org).run)
+    rec.step("update", "brand", at.text_input(key="update_brand_0").input(brand).run)
+    rec.step("update", "reports", at.multiselect(key="update_reports").set_value(["Google Trends"]).run)
+    at = rec.step("update", "save", at.button(key="update_save").click().run)
+    if rec.saved(at):
+        rec.expected["brands"].append((org, brand))
+
+
+def manage_session(rec, i, org, brand):
+    from streamlit.testing.v1 import AppTest
+
+    link = f"https://trends.example/{i}"
+    at = AppTest.from_file(SCRIPT, default_timeout=120)
+    rec.step("manage", "open app", at.run)
+    rec.step("manage", "open page", at.sidebar.radio[0].set_value("Manage Clients").run)
+    rec.step("manage", "search org", at.text_input(key="manage_org_search").input(org).run)
+    rec.step("manage", "select org", at.selectbox(key="manage_org_select").set_value(org).run)
+    rec.step("manage", "select brand", at.selectbox[1].set_value(brand).run)
+    rec.step("manage", "select section", at.selectbox[2].set_value("Google Trends").run)
+    link_input = next(t for t in at.text_input if t.label == "Link")
+    rec.step("manage", "edit link", link_input.input(link).run)
+    at = rec.step("manage", "save", _button(at, "Save Google Trends Changes").click().run)
+    if rec.saved(at):
+        rec.expected["links"].append((org, brand, link))
+
+
+FLOWS = {"onboard": onboard_session, "update": update_session, "manage": manage_session}
+
+
+def _init_worker(data_dir, storage_format):
+    data_manager.configure(data_dir, storage_format)
+    # Pay for the Streamlit import before the clock starts
+    import streamlit.testing.v1  # noqa: F401
+
+
+def run_session(flow, args):
+    rec = Recorder()
+    try:
+        FLOWS[flow](rec, *args)
+    except Exception as e:
+        rec.errors.append(f"{flow}: session crashed: {e!r}")
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+    return dict(rec.latencies), rec.saves, rec.rejected, rec.errors, rec.expected, peak_mb
+
+
+def count_lost_updates(expected):
+    # Read the file directly: load_raw() hides a corrupt store behind []
+    corrupt = None
+    try:
+        if data_manager.STORAGE_FORMAT == "json":
+            with open(data_manager.DATA_FILE) as f:
+                raw = json.load(f)
+        else:
+            raw = data_manager.load_raw()
+    except json.JSONDecodeError as e:
+        corrupt, raw = str(e), []
+    records = {r.organization: r for r in decode_records(raw)}
+    lost = defaultdict(int)
+    for org in expected["orgs"]:
+        if org not in records:
+            lost["onboard"] += 1
+    for org, brand in expected["brands"]:
+        if records.get(org) is None or records[org].get_brand(brand) is None:
+            lost["update"] += 1
+    for org, brand, link in expected["links"]:
+        b = records[org].get_brand(brand) if org in records else None
+        if b is None or b.data.google_trends is None or b.data.google_trends.link != link:
+            lost["manage"] += 1
+    return dict(lost), len(raw), corrupt
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=30, help="total simulated sessions")
+    parser.add_argument("--concurrency", type=int, default=30, help="sessions running at once")
+    parser.add_argument("--records", type=int, default=500, help="records seeded into the store")
+    parser.add_argument("--hot-orgs", type=int, default=3, help="organizations update/manage sessions contend for")
+    parser.add_argument("--storage-format", choices=list(data_manager.STORAGE_FORMATS), default="json")
+    parser.add_argument("--mix", default="onboard:4,update:3,manage:3", help="relative weight of each flow")
+    args = parser.parse_args()
+
+    weights = {k: int(v) for k, v in (part.split(":") for part in args.mix.split(","))}
+    rng = random.Random(0)
+    flows = rng.choices(list(weights), weights=list(weights.values()), k=args.sessions)
+    manage_count = flows.count("manage")
+    brands_per_hot = max(2, -(-manage_count // args.hot_orgs))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager.configure(tmp, args.storage_format)
+        portfolio = make_portfolio(args.records)
+        # Hot organizations get enough brands for every manage session to edit its own
+        hot = portfolio[:args.hot_orgs]
+        for record in hot:
+            record["brands"] = [{"name": f"{record['organization']} Brand {b + 1}", "data": {}}
+                                for b in range(brands_per_hot)]
+        data_manager.save_raw(portfolio)
+
+        jobs = []
+        manage_index = 0
+        for i, flow in enumerate(flows):
+            target = hot[i % len(hot)]
+            if flow == "onboard":
+                jobs.append((flow, (i,)))
+            elif flow == "update":
+                jobs.append((flow, (i, target["organization"])))
+            else:
+                target = hot[manage_index % len(hot)]
+                brand = target["brands"][(manage_index // len(hot)) % brands_per_hot]["name"]
+                jobs.append((flow, (i, target["organization"], brand)))
+                manage_index += 1
+
+        latencies = defaultdict(list)
+        expected = {"orgs": [], "brands": [], "links": []}
+        errors, peaks, saves, rejected = [], [], 0, 0
+        # AppTest rebinds __main__ to clients.py inside a worker, so workers
+        # must find the session functions by module name
+        from benchmarks import app_load_test as worker
+        with ProcessPoolExecutor(max_workers=args.concurrency, initializer=worker._init_worker,
+                                 initargs=(tmp, args.storage_format)) as pool:
+            # Start every worker (and its Streamlit import) before timing
+            list(pool.map(time.sleep, [0.2] * args.concurrency))
+            start = time.perf_counter()
+            for lat, n_saves, n_rejected, errs, exp, peak_mb in pool.map(worker.run_session, *zip(*jobs)):
+                for name, values in lat.items():
+                    latencies[name].extend(values)
+                for key, values in exp.items():
+                    expected[key].extend(values)
+                saves += n_saves
+                rejected += n_rejected
+                errors.extend(errs)
+                peaks.append(peak_mb)
+            wall = time.perf_counter() - start
+
+        lost, stored, corrupt = count_lost_updates(expected)
+        store_mb = os.path.getsize(data_manager.DATA_FILE) / 1e6
+
+    print(f"{args.sessions} sessions ({', '.join(f'{flows.count(k)} {k}' for k in weights)}), "
+          f"concurrency {args.concurrency}, {args.records} seeded records, {args.hot_orgs} hot orgs, "
+          f"{args.storage_format} store")
+    print(f"\n{'interaction':<28}{'n':>5}{'p50':>10}{'p90':>10}{'p99':>10}")
+    for name, values in sorted(latencies.items()):
+        print(f"{name:<28}{len(values):>5}{percentile(values, 0.5) * 1000:>8.0f}ms"
+              f"{percentile(values, 0.9) * 1000:>8.0f}ms{percentile(values, 0.99) * 1000:>8.0f}ms")
+    print(f"\nwall time {wall:.1f}s, saves {saves}, save throughput {saves / wall:.2f}/s, "
+          f"rejected as conflicts {rejected}")
+    print(f"lost updates: {sum(lost.values())} {lost or ''}")
+    if corrupt:
+        print(f"store is not valid JSON after the run: {corrupt}")
+    else:
+        print(f"store holds {stored} records; expected {args.records + len(expected['orgs'])}")
+    print(f"memory per session process: peak RSS max {max(peaks):.0f} MB, "
+          f"mean {sum(peaks) / len(peaks):.0f} MB; store {store_mb:.1f} MB")
+    if errors:
+        print(f"\n{len(errors)} errors, first few:")
+        for err in errors[:5]:
+            print(f"  {err}")
+
+
+if __name__ == "__main__":
+    main()
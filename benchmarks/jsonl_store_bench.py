@@ -0,0 +1,96 @@
+"""
+Compares the json store (full json.load per call) with the jsonl store
+(offset index + mmap, see utils/jsonl_store.py) on the calls the pages make.
+
+Each call is timed twice for jsonl: "cold" with the in-process index cache
+dropped (a fresh process reading the sidecar index) and "warm" (a Streamlit
+rerun in a long-running server).
+
+    python benchmarks/jsonl_store_bench.py --records 1000 10000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_portfolio
+from utils import data_manager, jsonl_store
+
+
+def timed(fn, repeat, before=None):
+    times = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench(n, repeat):
+    portfolio = make_portfolio(n)
+    rng = random.Random(1)
+    orgs = [r["organization"] for r in portfolio]
+    results = {}
+    notes = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ("json", "jsonl"):
+            data_manager.configure(tmp, fmt)
+            data_manager.save_raw(portfolio)
+            target = data_manager.get_record_by_org(rng.choice(orgs))
+
+            def update():
+                target.executive_name = f"Exec {rng.random()}"
+                data_manager.update_client_record(target)
+
+            calls = {
+                "get_all_organizations": data_manager.get_all_organizations,
+                "get_record_by_org": lambda: data_manager.get_record_by_org(rng.choice(orgs)),
+                "get_brands_for_org": lambda: data_manager.get_brands_for_org(rng.choice(orgs)),
+                "update_client_record": update,
+                "load_data (all)": data_manager.load_data,
+            }
+            for name, fn in calls.items():
+                if fmt == "json":
+                    results[(name, "json")] = timed(fn, repeat)
+                else:
+                    results[(name, "jsonl cold")] = timed(fn, repeat, before=jsonl_store._cache.clear)
+                    results[(name, "jsonl warm")] = timed(fn, repeat)
+            size = os.path.getsize(data_manager.DATA_FILE)
+            notes.append(f"{fmt} store {size / 1e6:.1f} MB")
+            if fmt == "jsonl":
+                size_index = os.path.getsize(jsonl_store.index_path(data_manager.DATA_FILE))
+                start = time.perf_counter()
+                data_manager.rebuild_index()
+                notes.append(f"jsonl index {size_index / 1e6:.2f} MB, "
+                             f"rebuild_index {(time.perf_counter() - start) * 1000:.0f}ms")
+    return results, notes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    columns = ["json", "jsonl cold", "jsonl warm"]
+    for n in args.records:
+        results, notes = bench(n, args.repeat)
+        print(f"\n{n} records (median of {args.repeat})")
+        print(f"{'':<24}" + "".join(f"{c:>14}" for c in columns))
+        for name in dict.fromkeys(name for name, _ in results):
+            print(f"{name:<24}" + "".join(f"{results[(name, c)] * 1000:>12.2f}ms" for c in columns))
+        for note in notes:
+            print(f"  {note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Times organization typeahead and duplicate detection (utils/name_index.py)
+on jsonl stores with realistic, overlapping organization and brand names,
+against the previous approach of filtering get_all_organizations() on every
+keystroke.
+
+"build" is the first lookup in a fresh process (the name index is built
+from the sidecar index); the other rows are medians over queries typed
+against the warm index.
+
+    python benchmarks/name_index_bench.py --orgs 10000 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_record
+from utils import data_manager, jsonl_store
+
+WORDS = ("acme blue green golden royal lanka ceylon global union prime star ocean metro city national "
+         "pacific eastern western summit apex fusion nova silver delta orion crystal lotus vertex urban "
+         "harbour island spice coral jade emerald sapphire ruby falcon eagle lion tiger peacock").split()
+TRADES = ("foods textiles motors finance insurance beverages telecom holdings apparel pharma logistics "
+          "hotels media electronics plantations cement paints tea dairy bank").split()
+SUFFIXES = ["", "", "(Pvt) Ltd", "PLC", "Ltd"]
+
+
+def make_names(n, rng):
+    names = set()
+    while len(names) < n:
+        name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {rng.choice(TRADES).title()}"
+        if rng.random() < 0.5:
+            name += f" {rng.randint(1, 999)}"
+        names.add(f"{name} {rng.choice(SUFFIXES)}".strip())
+    return sorted(names)
+
+
+def typo(name, rng):
+    chars = list(name)
+    i = rng.randrange(1, len(chars) - 1)
+    chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return "".join(chars)
+
+
+def median_ms(fn, queries):
+    times = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def bench(n, rng):
+    names = make_names(n, rng)
+    portfolio = []
+    for i, org in enumerate(names):
+        raw = make_record(i)
+        raw["organization"] = org
+        for brand in raw["brands"]:
+            brand["name"] = f"{rng.choice(WORDS).title()} {rng.choice(TRADES).title()}"
+        portfolio.append(raw)
+
+    sample = rng.sample(names, 50)
+    typed = [name[:rng.randint(3, 8)] for name in sample]
+    typos = [typo(name, rng) for name in sample]
+    rows = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager.configure(tmp, "jsonl")
+        data_manager.save_raw(portfolio)
+        jsonl_store._cache.clear()
+
+        start = time.perf_counter()
+        data_manager.search_organizations("x")
+        rows["build (first lookup)"] = (time.perf_counter() - start) * 1000
+
+        def old_filter(text):
+            text = text.lower()
+            return [o for o in data_manager.get_all_organizations() if text in o.lower()][:20]
+
+        rows["old: substring filter"] = median_ms(old_filter, typed)
+        rows["search: typed prefix"] = median_ms(data_manager.search_organizations, typed)
+        rows["search: full name, typo"] = median_ms(data_manager.search_organizations, typos)
+        rows["similar: exact name"] = median_ms(data_manager.find_similar_organizations, sample)
+        rows["similar: typo"] = median_ms(data_manager.find_similar_organizations, typos)
+
+        found = sum(1 for name, q in zip(sample, typos)
+                    if name in [m["organization"] for m in data_manager.search_organizations(q, limit=5)])
+        flagged = sum(1 for name, q in zip(sample, typos)
+                      if name in [m["organization"] for m in data_manager.find_similar_organizations(q)])
+
+        record = data_manager.get_record_by_org(sample[0])
+        record.organization = sample[0] + " Renamed"
+        start = time.perf_counter()
+        data_manager.update_client_record(record)
+        data_manager.search_organizations(record.organization)
+        rows["update + lookup"] = (time.perf_counter() - start) * 1000
+
+    notes = [f"typo queries: {found}/50 found in the top 5 by search, {flagged}/50 flagged by similar"]
+    return rows, notes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orgs", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    for n in args.orgs:
+        rows, notes = bench(n, rng)
+        print(f"\n{n} organizations")
+        for name, ms in rows.items():
+            print(f"  {name:<26}{ms:>10.2f}ms")
+        for note in notes:
+            print(f"  {note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Times data_manager.query() (secondary indexes) against the full-scan path
+it replaces (load_data() plus filtering in Python), for both storage formats.
+query_ids() is the index lookup alone; query() adds reading and decoding the
+matching records.
+
+    python benchmarks/query_bench.py --records 10000 50000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_portfolio
+from utils import data_manager
+
+QUERIES = {
+    "type=pitch, exec, Q1 2024": dict(type="pitch", executive="Amal Perera", date_from="2024-01-01", date_to="2024-03-31"),
+    "one week": dict(date_from="2023-06-01", date_to="2023-06-07"),
+    "report + social listening": dict(report="Google Ads", has_social_listening=True),
+    "onboard, exec, report": dict(type="onboard", executive="Nimali Silva", report="Web Traffic"),
+}
+
+
+def full_scan(type=None, executive=None, date_from=None, date_to=None, report=None, has_social_listening=None):
+    for r in data_manager.load_data():
+        if type and r.type != type:
+            continue
+        if executive and r.executive_name != executive:
+            continue
+        if date_from and (r.date or "") < date_from or date_to and (r.date or "") > date_to:
+            continue
+        if report and report not in r.reports:
+            continue
+        if has_social_listening is not None:
+            enabled = any(b.data.social_listening and b.data.social_listening.enabled for b in r.brands)
+            if enabled != has_social_listening:
+                continue
+        yield r
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, nargs="+", default=[10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for n in args.records:
+        portfolio = make_portfolio(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt in ("json", "jsonl"):
+                data_manager.configure(tmp, fmt)
+                data_manager.save_raw(portfolio)
+                # First query builds the indexes (jsonl: from the sidecar; json: one full parse)
+                start = time.perf_counter()
+                data_manager.query_facets()
+                first = time.perf_counter() - start
+                print(f"\n{n} records, {fmt} store (index ready in {first * 1000:.0f}ms)")
+                print(f"{'query':<28}{'matches':>8}{'query_ids()':>12}{'query()':>12}{'full scan':>12}")
+                for name, filters in QUERIES.items():
+                    t_ids, _ = timed(lambda: data_manager.query_ids(**filters), args.repeat)
+                    t_query, rows = timed(lambda: list(data_manager.query(**filters)), args.repeat)
+                    t_scan, expected = timed(lambda: list(full_scan(**filters)), 1)
+                    assert [r.id for r in rows] == [r.id for r in expected], name
+                    print(f"{name:<28}{len(rows):>8}{t_ids * 1000:>10.2f}ms{t_query * 1000:>10.2f}ms"
+                          f"{t_scan * 1000:>10.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Memory and decode time of a synthetic portfolio held as plain nested dicts
+(json.loads) versus the slotted ClientRecord model.
+
+    python benchmarks/record_memory.py --records 20000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_portfolio
+from utils.models import decode_records
+
+
+def measure(build):
+    # Time without tracing (tracemalloc slows allocation down several times)
+    gc.collect()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    del obj
+
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+
+    text = json.dumps(make_portfolio(args.records))
+    print(f"{args.records} records, {len(text) / 1e6:.1f} MB of JSON")
+
+    dicts, dict_bytes, dict_time = measure(lambda: json.loads(text))
+    del dicts
+
+    # Decode from a fresh parse so the dicts are garbage once decoding is done
+    records, model_bytes, model_time = measure(lambda: decode_records(json.loads(text)))
+
+    raw = json.loads(text)
+    start = time.perf_counter()
+    encoded = [r.to_dict() for r in records]
+    encode_time = time.perf_counter() - start
+    assert encoded == raw, "round trip changed the records"
+
+    print(f"{'':<18}{'memory':>12}{'load time':>12}")
+    print(f"{'nested dicts':<18}{dict_bytes / 1e6:>10.1f}MB{dict_time * 1000:>10.0f}ms")
+    print(f"{'ClientRecord':<18}{model_bytes / 1e6:>10.1f}MB{model_time * 1000:>10.0f}ms")
+    print(f"memory saved: {(1 - model_bytes / dict_bytes) * 100:.0f}%, "
+          f"encode back to stored format: {encode_time * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Startup and rerun timing for the Streamlit app.
+
+For every page, a fresh Python process loads the app with Streamlit's AppTest,
+then measures:
+  - cold start:  first run of the script (default page)
+  - first render: first run after switching to the page
+  - rerun:        median of further reruns of the same page
+and whether pandas / openpyxl ended up imported.
+
+Compare the working tree against an older commit with --ref, e.g.
+
+    python benchmarks/startup_timing.py --ref baseline --records 2000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_portfolio
+
+PAGES = ["Onboard Client", "Pitch Client", "Update Client", "Manage Clients", "Clients Details"]
+
+PROBE = r"""
+import json, sys, time
+script, page, reruns = sys.argv[1], sys.argv[2], int(sys.argv[3])
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file(script, default_timeout=120)
+at.run()
+t2 = time.perf_counter()
+if page != at.sidebar.radio[0].value:
+    at.sidebar.radio[0].set_value(page).run()
+t3 = time.perf_counter()
+samples = []
+for _ in range(reruns):
+    s = time.perf_counter()
+    at.run()
+    samples.append(time.perf_counter() - s)
+print(json.dumps({
+    "import_streamlit": t1 - t0,
+    "cold_start": t2 - t1,
+    "first_render": t3 - t2,
+    "rerun": samples,
+    "errors": [str(e.value) for e in at.exception],
+    "pandas": "pandas" in sys.modules,
+    "openpyxl": "openpyxl" in sys.modules,
+}))
+"""
+
+
+def export_ref(ref, dest):
+    archive = subprocess.run(["git", "-C", ROOT, "archive", ref], check=True, capture_output=True).stdout
+    subprocess.run(["tar", "-x", "-C", dest], input=archive, check=True)
+
+
+def measure(tree, workdir, reruns):
+    script = os.path.join(tree, "clients.py")
+    results = {}
+    for page in PAGES:
+        proc = subprocess.run(
+            [sys.executable, "-c", PROBE, script, page, str(reruns)],
+            cwd=workdir, capture_output=True, text=True,
+            env=dict(os.environ, PYTHONPATH=tree),
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{page}: {proc.stderr[-2000:]}")
+        results[page] = json.loads(proc.stdout.strip().splitlines()[-1])
+    return results
+
+
+def report(label, results):
+    print(f"\n== {label} ==")
+    print(f"{'page':<18}{'cold start':>12}{'1st render':>12}{'rerun p50':>12}  pandas  openpyxl")
+    for page, r in results.items():
+        rerun = statistics.median(r["rerun"]) if r["rerun"] else float("nan")
+        print(f"{page:<18}{r['cold_start'] * 1000:>10.1f}ms{r['first_render'] * 1000:>10.1f}ms"
+              f"{rerun * 1000:>10.1f}ms  {str(r['pandas']):<7} {str(r['openpyxl'])}")
+        for err in r["errors"]:
+            print(f"    error: {err}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ref", help="git ref to compare against (e.g. baseline commit)")
+    parser.add_argument("--records", type=int, default=500, help="synthetic records to seed")
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = os.path.join(tmp, "work")
+        os.makedirs(os.path.join(workdir, "data"))
+        with open(os.path.join(workdir, "data", "clients.json"), "w") as f:
+            json.dump(make_portfolio(args.records), f)
+
+        if args.ref:
+            old_tree = os.path.join(tmp, "ref")
+            os.makedirs(old_tree)
+            export_ref(args.ref, old_tree)
+            report(f"{args.ref}", measure(old_tree, workdir, args.reruns))
+
+        report("working tree", measure(ROOT, workdir, args.reruns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import random
+from datetime import date, timedelta
+
+# Synthetic client records in the stored format, used by the benchmarks to
+# build large portfolios without touching real data.
+
+PLATFORMS = ["facebook", "instagram", "twitter", "tiktok", "linkedin", "youtube", "website"]
+REPORTS = [
+    "Competitor Analysis", "Google Trends", "Web Traffic",
+    "Social Listening", "Meta Platform", "Google Analytics",
+    "Meta Campaigns", "Google Ads"
+]
+EXECUTIVES = ["Amal Perera", "Nimali Silva", "Kasun Fernando", "Dilani Jayasinghe", "Ruwan Bandara"]
+
+
+def _socials(name, rng):
+    slug = name.lower().replace(" ", "")
+    return {p: (f"https://{p}.com/{slug}" if rng.random() < 0.8 else "") for p in PLATFORMS}
+
+
+def make_brand(name, reports, rng):
+    data = {}
+    competitors = []
+    if "Competitor Analysis" in reports:
+        competitors = [
+            {"name": f"{name} Rival {j + 1}", "socials": _socials(f"{name} Rival {j + 1}", rng)}
+            for j in range(rng.randint(1, 5))
+        ]
+        data["competitor_analysis"] = {"brand_socials": _socials(name, rng), "competitors": competitors}
+    if "Google Trends" in reports:
+        data["google_trends"] = {
+            "link": f"https://trends.google.com/trends/explore?q={name.replace(' ', '+')}",
+            "search_terms": ", ".join(f"{name} term {k}" for k in range(3)),
+        }
+    if "Web Traffic" in reports:
+        data["web_traffic"] = {"selected_competitors": [c["name"] for c in competitors[:4]]}
+    if "Social Listening" in reports:
+        enabled = rng.random() < 0.7
+        data["social_listening"] = {"enabled": enabled}
+        if enabled:
+            data["social_listening"]["brand_health"] = {
+                "keywords": [f"{name} keyword {k}" for k in range(rng.randint(1, 10))],
+                "hashtags": [f"#{name.replace(' ', '')}{k}" for k in range(rng.randint(0, 10))],
+            }
+    for report, key in [("Meta Platform", "meta_platform"), ("Google Analytics", "google_analytics"),
+                        ("Meta Campaigns", "meta_campaigns"), ("Google Ads", "google_ads")]:
+        if report in reports:
+            data[key] = f"{name} {report} access: page admin, ad account {rng.randint(1000, 9999)}"
+    return {"name": name, "data": data}
+
+
+def make_record(i, rng=None):
+    rng = rng or random.Random(i)
+    org = f"Organization {i:06d}"
+    rec_type = "pitch" if rng.random() < 0.6 else "onboard"
+    if rec_type == "pitch":
+        reports = rng.sample(["Competitor Analysis", "Social Listening"], rng.randint(1, 2))
+    else:
+        reports = rng.sample(REPORTS, rng.randint(1, len(REPORTS)))
+    day = date(2022, 1, 1) + timedelta(days=rng.randint(0, 1400))
+
+    record = {
+        "executive_name": rng.choice(EXECUTIVES),
+        "organization": org,
+        "brands": [make_brand(f"{org} Brand {b + 1}", reports, rng) for b in range(rng.randint(1, 4))],
+        "reports": reports,
+        "type": rec_type,
+        "id": f"{20240101000000000000 + i}",
+        "created_at": f"{day.isoformat()}T09:00:00",
+        "version": 1,
+    }
+    record["presentation_date" if rec_type == "pitch" else "onboard_date"] = day.isoformat()
+    return record
+
+
+def make_portfolio(n, seed=0):
+    rng = random.Random(seed)
+    return [make_record(i, rng) for i in range(n)]
@@ -0,0 +1,396 @@
+"""
+Command line interface for the client data store.
+
+Runs the batch jobs that otherwise need the Streamlit UI (nightly exports,
+bulk imports, integrity checks) without importing Streamlit. Every command
+streams over the records, so memory stays bounded on large stores.
+
+    python cli.py export --format jsonl -o clients.jsonl
+    python cli.py export --org "Acme" --format xlsx -o acme.xlsx
+    python cli.py export --format parquet -o exports/
+    python cli.py import clients.jsonl --mode upsert
+    python cli.py stats
+    python cli.py reindex
+    python cli.py compact --keep-versions 50
+    python cli.py validate
+    python cli.py convert --to jsonl
+    python cli.py --storage-format jsonl rebuild-index
+    python cli.py import-excel edited.xlsx --apply
+    python cli.py query --type pitch --report "Social Listening" --from 2024-01-01
+    python cli.py archive run --dry-run
+    python cli.py archive search "acme" --type pitch
+    python cli.py archive restore 20240101000000000123
+
+The data directory and storage format come from --data-dir and
+--storage-format, or the CLIENTS_DATA_DIR and CLIENTS_STORAGE_FORMAT
+environment variables.
+
+Exit codes: 0 success, 1 problems found (validation / import errors),
+2 usage error (including an input file that is missing or unreadable),
+3 organization not found.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+
+from utils import data_manager, version_history
+from utils.models import ClientRecord
+
+EXIT_OK = 0
+EXIT_PROBLEMS = 1
+EXIT_USAGE = 2
+EXIT_NOT_FOUND = 3
+
+
+def _open_output(path, binary=False):
+    if path in (None, "-"):
+        return sys.stdout.buffer if binary else sys.stdout
+    return open(path, "wb" if binary else "w")
+
+
+def _iter_file(path):
+    # JSON array or JSON Lines, detected from the first non-blank character
+    with open(path, "r") as f:
+        first = ""
+        while True:
+            ch = f.read(1)
+            if not ch or not ch.isspace():
+                first = ch
+                break
+        f.seek(0)
+        if first == "[":
+            yield from data_manager.iter_json_array(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def cmd_export(args):
+    records = data_manager.iter_records()
+    if args.org:
+        # An organization can have several records (e.g. a pitch and an onboard)
+        records = data_manager.get_records_by_org(args.org)
+        if not records:
+            print(f"Organization not found: {args.org}", file=sys.stderr)
+            return EXIT_NOT_FOUND
+
+    if args.format in ("parquet", "arrow"):
+        from utils import columnar_export
+        if not args.output or args.output == "-":
+            print("--output must be a directory for columnar formats", file=sys.stderr)
+            return EXIT_USAGE
+        tables = columnar_export.export_portfolio(args.output, fmt=args.format, records=records)
+        for name, (path, rows) in tables.items():
+            print(f"{name:<16}{rows:>10} rows  {path}", file=sys.stderr)
+        return EXIT_OK
+
+    if args.format == "xlsx":
+        from utils import excel_export
+        out = _open_output(args.output, binary=True)
+        excel_export.write_excel(records, out)
+        if out is not sys.stdout.buffer:
+            out.close()
+        return EXIT_OK
+
+    out = _open_output(args.output)
+    count = 0
+    if args.format == "jsonl":
+        for record in records:
+            out.write(json.dumps(record.to_dict()) + "\n")
+            count += 1
+    else:
+        out.write("[")
+        for record in records:
+            out.write(",\n" if count else "\n")
+            out.write(json.dumps(record.to_dict()))
+            count += 1
+        out.write("\n]\n")
+    if out is not sys.stdout:
+        out.close()
+    print(f"Exported {count} records", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_import(args):
+    # Pass 1: validate the input and collect its ids, without keeping records
+    incoming_ids = {}  # id -> position of its record in the input
+    problems = 0
+    try:
+        for i, raw in enumerate(_iter_file(args.file)):
+            try:
+                record = ClientRecord.from_dict(raw)
+            except ValueError as e:
+                print(f"#{i}: {e}", file=sys.stderr)
+                problems += 1
+                continue
+            if record.id in incoming_ids:
+                print(f"#{i}: duplicate id {record.id} (also #{incoming_ids[record.id]})", file=sys.stderr)
+                problems += 1
+            elif record.id:
+                incoming_ids[record.id] = i
+    except (OSError, ValueError) as e:
+        # Missing file or broken JSON: a bad invocation, not a data problem
+        print(f"Cannot read {args.file}: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    if problems:
+        print(f"{problems} invalid records, nothing imported", file=sys.stderr)
+        return EXIT_PROBLEMS
+
+    # Pass 2: stream the store and then the input into a new store file
+    replaced = {}
+    skipped = set()
+    summary = Counter()
+
+    def merged():
+        for raw in data_manager.iter_raw():
+            rid = raw.get("id")
+            if rid in incoming_ids:
+                if args.mode == "add":
+                    skipped.add(rid)
+                else:
+                    version = raw.get("version", 1)
+                    replaced[rid] = version
+                    if version_history.latest_version(data_manager.HISTORY_DIR, rid) is None:
+                        version_history.append_version(data_manager.HISTORY_DIR, rid, version, raw, op="seed")
+                    continue
+            yield raw
+
+        for raw in _iter_file(args.file):
+            record = ClientRecord.from_dict(raw)
+            if record.id in skipped:
+                summary["skipped"] += 1
+                continue
+            if record.id is None:
+                record.id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+            if record.created_at is None:
+                record.created_at = datetime.now().isoformat()
+            record.version = replaced.get(record.id, 0) + 1
+            summary["updated" if record.id in replaced else "added"] += 1
+            raw = record.to_dict()
+            version_history.append_version(data_manager.HISTORY_DIR, record.id, record.version, raw, op="import")
+            yield raw
+
+    # UI saves made during the run wait for it instead of being overwritten
+    with data_manager.store_lock():
+        total = data_manager.save_raw_stream(merged())
+    print(f"Imported: {summary['added']} added, {summary['updated']} updated, "
+          f"{summary['skipped']} skipped (id exists); store now has {total} records", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_stats(args):
+    types = Counter()
+    orgs = set()
+    counts = Counter()
+    for record in data_manager.iter_records():
+        counts["records"] += 1
+        types[record.type] += 1
+        orgs.add(record.organization)
+        for brand in record.brands:
+            counts["brands"] += 1
+            counts["competitors"] += len(brand.data.competitors)
+            sl = brand.data.social_listening
+            if sl and sl.brand_health:
+                counts["keywords"] += len(sl.brand_health.keywords)
+                counts["hashtags"] += len(sl.brand_health.hashtags)
+
+    history_files = history_bytes = 0
+    if os.path.isdir(data_manager.HISTORY_DIR):
+        for entry in os.scandir(data_manager.HISTORY_DIR):
+            history_files += 1
+            history_bytes += entry.stat().st_size
+
+    stats = {
+        "records": counts["records"],
+        "organizations": len(orgs),
+        "by_type": dict(types),
+        "brands": counts["brands"],
+        "competitors": counts["competitors"],
+        "keywords": counts["keywords"],
+        "hashtags": counts["hashtags"],
+        "storage_format": data_manager.STORAGE_FORMAT,
+        "store_bytes": os.path.getsize(data_manager.DATA_FILE),
+        "history_files": history_files,
+        "history_bytes": history_bytes,
+    }
+    from utils import archive
+    stats.update(archive.stats())
+    print(json.dumps(stats, indent=2))
+    return EXIT_OK
+
+
+def cmd_reindex(args):
+    print(json.dumps(data_manager.reindex(), indent=2))
+    return EXIT_OK
+
+
+def cmd_compact(args):
+    print(json.dumps(data_manager.compact(keep_versions=args.keep_versions), indent=2))
+    return EXIT_OK
+
+
+def cmd_rebuild_index(args):
+    count = data_manager.rebuild_index()
+    if count is None:
+        print("rebuild-index needs the jsonl storage format (--storage-format jsonl)", file=sys.stderr)
+        return EXIT_USAGE
+    print(f"Indexed {count} records", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_convert(args):
+    source = data_manager.DATA_FILE
+    count = data_manager.convert_storage(args.to)
+    print(f"Copied {count} records from {source} to {data_manager.DATA_FILE}; "
+          f"set CLIENTS_STORAGE_FORMAT={args.to} to use it", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_import_excel(args):
+    from utils import excel_import
+    try:
+        plan = excel_import.plan_import(args.file)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read {args.file}: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    for number, problem in plan["issues"]:
+        print(f"row {number}: {problem}", file=sys.stderr)
+    for change in plan["changes"]:
+        for d in change["diff"]:
+            print(f"{change['organization']} ({change['type']}): {d['path']}: {json.dumps(d['old'])} -> {json.dumps(d['new'])}")
+    print(f"{plan['rows']} rows read, {len(plan['changes'])} records changed", file=sys.stderr)
+    if not args.apply:
+        if plan["changes"]:
+            print("Dry run; pass --apply to write these changes", file=sys.stderr)
+        return EXIT_PROBLEMS if plan["issues"] else EXIT_OK
+    updated, conflicts = excel_import.apply_import(plan)
+    print(f"Updated {len(updated)} records; {len(conflicts)} conflicts (changed since read, not updated)",
+          file=sys.stderr)
+    return EXIT_PROBLEMS if conflicts or plan["issues"] else EXIT_OK
+
+
+def cmd_query(args):
+    social_listening = {"yes": True, "no": False}.get(args.social_listening)
+    count = 0
+    for record in data_manager.query(type=args.type, executive=args.executive, date_from=args.date_from,
+                                     date_to=args.date_to, report=args.report,
+                                     has_social_listening=social_listening):
+        print(json.dumps(record.to_dict()))
+        count += 1
+    print(f"{count} records match", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_archive(args):
+    from utils import archive
+    if args.action == "run":
+        print(json.dumps(archive.archive(dry_run=args.dry_run), indent=2))
+        return EXIT_OK
+    if args.action == "search":
+        results = archive.search(args.text, types=args.type, date_from=args.date_from, date_to=args.date_to)
+        for r in results:
+            print(json.dumps(r))
+        print(f"{len(results)} archived records match", file=sys.stderr)
+        return EXIT_OK
+    if args.action == "restore":
+        record = archive.restore(args.id)
+        if record is None:
+            print(f"No archived record with id {args.id}", file=sys.stderr)
+            return EXIT_NOT_FOUND
+        print(f"Restored {record.organization} ({record.id})", file=sys.stderr)
+        return EXIT_OK
+    print(json.dumps(archive.stats(), indent=2))
+    return EXIT_OK
+
+
+def cmd_validate(args):
+    problems = 0
+    for label, problem in data_manager.validate():
+        print(f"{label}: {problem}")
+        problems += 1
+    print(f"{problems} problems found", file=sys.stderr)
+    return EXIT_PROBLEMS if problems else EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", help="data directory (default: $CLIENTS_DATA_DIR or ./data)")
+    parser.add_argument("--storage-format", choices=list(data_manager.STORAGE_FORMATS),
+                        help="store file format (default: $CLIENTS_STORAGE_FORMAT or json)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("export", help="export the records of one organization or all records")
+    p.add_argument("--org", help="only export this organization")
+    p.add_argument("--format", choices=["json", "jsonl", "xlsx", "parquet", "arrow"], default="json")
+    p.add_argument("-o", "--output", help="output file (directory for parquet/arrow); '-' for stdout")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="import records from a JSON array or JSON Lines file")
+    p.add_argument("file")
+    p.add_argument("--mode", choices=["upsert", "add"], default="upsert",
+                   help="upsert replaces records with the same id; add skips them")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("stats", help="print counts and storage sizes")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("reindex", help="repair ids/versions and seed missing history")
+    p.set_defaults(func=cmd_reindex)
+
+    p = sub.add_parser("compact", help="rewrite the store and history logs")
+    p.add_argument("--keep-versions", type=int, help="only keep the last N versions of each record")
+    p.set_defaults(func=cmd_compact)
+
+    p = sub.add_parser("validate", help="check every record; exit 1 on problems")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("rebuild-index", help="rebuild the offset index of a jsonl store")
+    p.set_defaults(func=cmd_rebuild_index)
+
+    p = sub.add_parser("import-excel", help="apply the edits in an exported Detailed Data workbook")
+    p.add_argument("file")
+    p.add_argument("--apply", action="store_true", help="write the changes (default: only show them)")
+    p.set_defaults(func=cmd_import_excel)
+
+    p = sub.add_parser("query", help="print the records matching filters as JSON Lines")
+    p.add_argument("--type", action="append", help="record type (repeatable: any of)")
+    p.add_argument("--executive", action="append", help="executive name (repeatable: any of)")
+    p.add_argument("--report", action="append", help="selected report (repeatable: any of)")
+    p.add_argument("--from", dest="date_from", help="earliest presentation/onboard date, YYYY-MM-DD")
+    p.add_argument("--to", dest="date_to", help="latest presentation/onboard date, YYYY-MM-DD")
+    p.add_argument("--social-listening", choices=["yes", "no"], help="social listening enabled on any brand")
+    p.set_defaults(func=cmd_query)
+
+    p = sub.add_parser("archive", help="move records to cold storage, search and restore them")
+    actions = p.add_subparsers(dest="action", required=True)
+    a = actions.add_parser("run", help="archive every record matching the archive policies")
+    a.add_argument("--dry-run", action="store_true", help="only report what would be archived")
+    a = actions.add_parser("search", help="search archived records by organization or brand name")
+    a.add_argument("text", nargs="?", default="")
+    a.add_argument("--type", action="append", help="record type (repeatable)")
+    a.add_argument("--date-from", help="YYYY-MM-DD")
+    a.add_argument("--date-to", help="YYYY-MM-DD")
+    a = actions.add_parser("restore", help="move an archived record back into the store")
+    a.add_argument("id")
+    actions.add_parser("stats", help="print cold storage counts and sizes")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser("convert", help="copy the store into another storage format")
+    p.add_argument("--to", choices=list(data_manager.STORAGE_FORMATS), required=True)
+    p.set_defaults(func=cmd_convert)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.data_dir or args.storage_format:
+        data_manager.configure(args.data_dir, args.storage_format)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
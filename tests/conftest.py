@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import data_manager
+
+
+@pytest.fixture(params=["json", "jsonl"])
+def store(request, tmp_path, monkeypatch):
+    """data_manager pointed at an empty store in tmp_path, in each storage format."""
+    for name in ("DATA_DIR", "DATA_FILE", "HISTORY_DIR", "STORAGE_FORMAT"):
+        monkeypatch.setattr(data_manager, name, getattr(data_manager, name))
+    data_manager.configure(str(tmp_path), request.param)
+    data_manager.ensure_data_file()
+    return data_manager
+
+
+@pytest.fixture
+def make_raw():
+    return _make_raw
+
+
+def _make_raw(organization, type="pitch", brands=("Brand A",), record_id=None):
+    """A small stored record with competitor analysis and Google Trends data per brand."""
+    raw = {
+        "executive_name": "Exec",
+        "organization": organization,
+        "type": type,
+        "reports": ["Competitor Analysis"],
+        "brands": [{"name": name, "data": {
+            "competitor_analysis": {
+                "brand_socials": {"facebook": f"fb/{name}", "tiktok": None},
+                "competitors": [{"name": "Rival", "socials": {"facebook": "fb/rival"}}],
+            },
+            "google_trends": {"link": "", "search_terms": name},
+        }} for name in brands],
+    }
+    if type == "pitch":
+        raw["presentation_date"] = "2024-01-01"
+    else:
+        raw["onboard_date"] = "2024-01-01"
+    if record_id is not None:
+        raw["id"] = record_id
+    return raw
@@ -0,0 +1,63 @@
+import json
+import threading
+
+import pytest
+
+
+def test_stale_save_is_refused(store, make_raw):
+    record = store.add_client_record(make_raw("Acme"))
+    mine, theirs = store.get_record(record.id), store.get_record(record.id)
+    theirs.executive_name = "Them"
+    assert store.update_client_record(theirs)
+    mine.executive_name = "Me"
+    assert not store.update_client_record(mine)
+    assert store.get_record(record.id).executive_name == "Them"
+    assert store.update_client_record(mine, check_version=False)
+    assert [v["version"] for v in store.list_versions(record.id)] == [1, 2, 3]
+
+
+def test_restore_is_refused_over_a_newer_save(store, make_raw):
+    record = store.add_client_record(make_raw("Acme"))
+    page = store.get_record(record.id)
+    record.executive_name = "Changed"
+    assert store.update_client_record(record)
+
+    assert store.restore_version(record.id, 1, expected_version=page.version) is None
+    assert store.get_record(record.id).executive_name == "Changed"
+
+    restored = store.restore_version(record.id, 1, expected_version=2)
+    assert (restored.version, restored.executive_name) == (3, "Exec")
+    assert store.list_versions(record.id)[-1]["op"] == "restore"
+
+
+def test_deleted_record_can_be_restored(store, make_raw):
+    record = store.add_client_record(make_raw("Acme"))
+    store.delete_client_record(record.id)
+    assert store.get_record(record.id) is None
+    assert store.restore_version(record.id, 1).version == 3
+    assert list(store.validate()) == []
+
+
+def test_concurrent_adds_from_threads_all_land(store, make_raw):
+    def add(k):
+        for i in range(20):
+            store.add_client_record(make_raw(f"Org {k}-{i}", record_id=f"{k}-{i}"))
+
+    threads = [threading.Thread(target=add, args=(k,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(1 for _ in store.iter_raw()) == 80
+    assert list(store.validate()) == []
+
+
+def test_unreadable_json_store_is_not_saved_over(store, make_raw):
+    if store.STORAGE_FORMAT != "json":
+        pytest.skip("json format only")
+    with open(store.DATA_FILE, "w") as f:
+        f.write('[{"id": "a"}')
+    with pytest.raises(json.JSONDecodeError):
+        store.add_client_record(make_raw("Acme"))
+    with open(store.DATA_FILE) as f:
+        assert f.read() == '[{"id": "a"}'
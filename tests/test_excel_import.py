@@ -0,0 +1,131 @@
+import pytest
+
+pytest.importorskip("openpyxl")
+from openpyxl import load_workbook
+
+from utils import excel_export, excel_import
+
+
+def _export(store, tmp_path):
+    path = str(tmp_path / "export.xlsx")
+    excel_export.write_excel(list(store.iter_records()), path)
+    return path
+
+
+def _edit(path, match, column, value):
+    """Sets column on every row whose cells include all of match; returns how many rows changed."""
+    wb = load_workbook(path)
+    ws = wb["Detailed Data"]
+    header = [c.value for c in ws[1]]
+    changed = 0
+    for row in ws.iter_rows(min_row=2):
+        cells = dict(zip(header, row))
+        if all(cells[k].value == v for k, v in match.items()):
+            cells[column].value = value
+            changed += 1
+    wb.save(path)
+    return changed
+
+
+def _drop_record_ids(path):
+    wb = load_workbook(path)
+    ws = wb["Detailed Data"]
+    header = [c.value for c in ws[1]]
+    ws.delete_cols(header.index("Record ID") + 1)
+    wb.save(path)
+
+
+@pytest.fixture
+def acme(store, make_raw):
+    """An organization with a pitch and an onboard record, plus another organization."""
+    pitch = store.add_client_record(make_raw("Acme", "pitch"))
+    onboard = store.add_client_record(make_raw("Acme", "onboard"))
+    other = store.add_client_record(make_raw("Other", "pitch", brands=("Brand A", "Brand B")))
+    return pitch, onboard, other
+
+
+def test_untouched_workbook_changes_nothing(store, acme, tmp_path):
+    plan = excel_import.plan_import(_export(store, tmp_path))
+    assert plan["changes"] == []
+    assert plan["issues"] == []
+    assert plan["rows"] > 0
+
+
+def test_record_id_column_is_hidden(store, acme, tmp_path):
+    path = _export(store, tmp_path)
+    ws = load_workbook(path)["Detailed Data"]
+    header = [c.value for c in ws[1]]
+    letter = ws.cell(row=1, column=header.index("Record ID") + 1).column_letter
+    assert ws.column_dimensions[letter].hidden
+
+
+def test_edit_lands_on_the_matching_record_only(store, acme, tmp_path):
+    pitch, onboard, _ = acme
+    path = _export(store, tmp_path)
+    assert _edit(path, {"Organization": "Acme", "Type": "onboard", "Category": "Google Trends",
+                        "Sub-Category": "Link"}, "Detail", "https://trends/new") == 1
+
+    plan = excel_import.plan_import(path)
+    assert [(c["id"], c["type"]) for c in plan["changes"]] == [(onboard.id, "onboard")]
+    assert [(d["path"], d["old"], d["new"]) for d in plan["changes"][0]["diff"]] == [
+        ("brands[0].data.google_trends.link", "", "https://trends/new")]
+
+    updated, conflicts = excel_import.apply_import(plan)
+    assert (updated, conflicts) == ([onboard.id], [])
+    assert store.get_record(onboard.id).brands[0].data.google_trends.link == "https://trends/new"
+    assert store.get_record(pitch.id).brands[0].data.google_trends.link == ""
+
+
+def test_cleared_cell_clears_a_set_field(store, acme, tmp_path):
+    _, _, other = acme
+    path = _export(store, tmp_path)
+    _edit(path, {"Organization": "Other", "Brand": "Brand B", "Category": "Brand Socials",
+                 "Sub-Category": "Facebook"}, "Detail", None)
+    plan = excel_import.plan_import(path)
+    assert [(d["path"], d["new"]) for c in plan["changes"] for d in c["diff"]] == [
+        ("brands[1].data.competitor_analysis.brand_socials.facebook", "")]
+
+
+def test_old_workbook_falls_back_to_organization_and_type(store, acme, tmp_path):
+    pitch, _, _ = acme
+    path = _export(store, tmp_path)
+    _drop_record_ids(path)
+    _edit(path, {"Organization": "Acme", "Type": "pitch", "Category": "Google Trends",
+                 "Sub-Category": "Search Terms"}, "Detail", "acme pitch")
+    plan = excel_import.plan_import(path)
+    assert [c["id"] for c in plan["changes"]] == [pitch.id]
+    assert plan["issues"] == []
+
+
+def test_old_workbook_rows_are_ambiguous_when_several_records_match(store, acme, make_raw, tmp_path):
+    path = _export(store, tmp_path)
+    _drop_record_ids(path)
+    store.add_client_record(make_raw("Acme", "pitch"))
+    plan = excel_import.plan_import(path)
+    assert plan["changes"] == []
+    assert len(plan["issues"]) == 1
+    assert "has 2 pitch records" in plan["issues"][0][1]
+
+
+def test_unknown_brand_and_category_are_reported(store, acme, tmp_path):
+    path = _export(store, tmp_path)
+    _edit(path, {"Organization": "Other", "Brand": "Brand B", "Category": "Google Trends",
+                 "Sub-Category": "Link"}, "Brand", "Missing Brand")
+    _edit(path, {"Organization": "Other", "Brand": "Brand A", "Category": "Google Trends",
+                 "Sub-Category": "Link"}, "Category", "Nonsense")
+    problems = [problem for _, problem in excel_import.plan_import(path)["issues"]]
+    assert problems == ["Unknown category 'Nonsense'; row skipped", "Unknown brand 'Missing Brand'; row skipped"]
+
+
+def test_records_saved_since_the_plan_are_conflicts(store, acme, tmp_path):
+    _, onboard, _ = acme
+    path = _export(store, tmp_path)
+    _edit(path, {"Organization": "Acme", "Type": "onboard", "Category": "Google Trends",
+                 "Sub-Category": "Link"}, "Detail", "https://trends/new")
+    plan = excel_import.plan_import(path)
+
+    record = store.get_record(onboard.id)
+    record.executive_name = "Someone Else"
+    assert store.update_client_record(record)
+    assert excel_import.apply_import(plan) == ([], [onboard.id])
+    assert store.get_record(onboard.id).brands[0].data.google_trends.link == ""
@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+from utils import jsonl_store
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = str(tmp_path / "clients.jsonl")
+    open(path, "w").close()
+    yield path
+    jsonl_store._cache.pop(path, None)
+
+
+def _record(record_id, organization, **extra):
+    return dict({"id": record_id, "organization": organization, "type": "pitch", "brands": [{"name": "B"}]}, **extra)
+
+
+def _append_raw(path, text):
+    # What another process appending to the log looks like to this one
+    with open(path, "a") as f:
+        f.write(text)
+
+
+def _fresh_index(path):
+    # A new process: nothing cached, only the sidecar on disk
+    jsonl_store._cache.pop(path, None)
+    return jsonl_store.load_index(path)
+
+
+def test_last_line_wins_and_tombstones_delete(log):
+    jsonl_store.put(log, _record("a", "Acme"))
+    jsonl_store.put(log, _record("b", "Beta"))
+    jsonl_store.put(log, _record("a", "Acme Renamed"))
+    jsonl_store.delete(log, "b")
+    assert jsonl_store.get(log, "a")["organization"] == "Acme Renamed"
+    assert jsonl_store.get(log, "b") is None
+    assert [r["id"] for r in jsonl_store.iter_raw(log)] == ["a"]
+    assert jsonl_store.organizations(log) == ["Acme Renamed"]
+
+
+def test_lines_appended_elsewhere_are_picked_up_by_the_tail_scan(log):
+    jsonl_store.put(log, _record("a", "Acme"))
+    jsonl_store.load_index(log)
+    _append_raw(log, json.dumps(_record("b", "Beta", type="onboard")) + "\n"
+                + json.dumps({jsonl_store.TOMBSTONE: "a"}) + "\n")
+    assert [r["id"] for r in jsonl_store.iter_raw(log)] == ["b"]
+    assert jsonl_store.query_ids(log, type="onboard") == ["b"]
+    assert [m["organization"] for m in jsonl_store.search_names(log, "bet")] == ["Beta"]
+
+
+def test_stale_sidecar_is_caught_up_from_the_log(log):
+    for i in range(5):
+        jsonl_store.put(log, _record(f"r{i}", f"Org {i}"))
+    sidecar_size = json.load(open(jsonl_store.index_path(log)))["size"]
+    assert sidecar_size < os.path.getsize(log)  # saves do not rewrite the sidecar
+
+    index = _fresh_index(log)
+    assert list(index.entries) == [f"r{i}" for i in range(5)]
+    assert index.size == os.path.getsize(log)
+
+
+def test_sidecar_is_rewritten_once_the_tail_outgrows_it(log, monkeypatch):
+    monkeypatch.setattr(jsonl_store, "INDEX_SAVE_MIN_BYTES", 0)
+    for i in range(50):
+        jsonl_store.put(log, _record(f"r{i}", f"Org {i}"))
+    sidecar = json.load(open(jsonl_store.index_path(log)))
+    assert sidecar["size"] >= os.path.getsize(log) * (1 - jsonl_store.INDEX_SAVE_RATIO)
+
+
+def test_unfinished_line_is_left_for_later(log):
+    jsonl_store.put(log, _record("a", "Acme"))
+    line = json.dumps(_record("b", "Beta"))
+    _append_raw(log, line[:10])
+    assert jsonl_store.get(log, "b") is None
+    _append_raw(log, line[10:] + "\n")
+    assert jsonl_store.get(log, "b")["organization"] == "Beta"
+
+
+def test_replaced_log_is_reindexed(log):
+    jsonl_store.put(log, _record("a", "Acme"))
+    jsonl_store.load_index(log)
+    tmp = log + ".new"
+    with open(tmp, "w") as f:
+        f.write(json.dumps(_record("z", "Zeta")) + "\n")
+    os.replace(tmp, log)
+    assert [r["id"] for r in jsonl_store.iter_raw(log)] == ["z"]
+
+
+def test_rewrite_drops_superseded_lines_and_matches_a_rebuild(log):
+    for i in range(3):
+        jsonl_store.put(log, _record("a", f"Acme {i}"))
+    jsonl_store.put(log, _record("b", "Beta"))
+    assert jsonl_store.rewrite(log, list(jsonl_store.iter_raw(log))) == 2
+    with open(log) as f:
+        assert len(f.readlines()) == 2
+    rewritten = {k: v for k, v in jsonl_store.load_index(log).entries.items()}
+    assert jsonl_store.rebuild_index(log) == 2
+    assert jsonl_store.load_index(log).entries == rewritten
@@ -0,0 +1,35 @@
+import pytest
+
+from utils.models import ClientRecord, LazyRecords, RecordValidationError
+
+
+def test_to_dict_fills_defaults_for_absent_fields():
+    d = {"organization": "A", "brands": [{"name": "b", "data": {"google_trends": {"link": "x"}}}]}
+    out = ClientRecord.from_dict(d).to_dict()
+    assert out["executive_name"] == "" and out["type"] == "onboard" and out["reports"] == []
+    assert out["brands"][0]["data"]["google_trends"] == {"link": "x", "search_terms": ""}
+
+
+def test_round_trip_is_exact_for_the_canonical_layout(make_raw):
+    canonical = ClientRecord.from_dict(dict(make_raw("Acme"), custom_field=[1, 2])).to_dict()
+    assert ClientRecord.from_dict(canonical).to_dict() == canonical
+    assert canonical["custom_field"] == [1, 2]
+    assert "tiktok" in canonical["brands"][0]["data"]["competitor_analysis"]["brand_socials"]
+    assert "instagram" not in canonical["brands"][0]["data"]["competitor_analysis"]["brand_socials"]
+
+
+def test_lazy_records_decode_on_access_and_encode_back(make_raw):
+    raws = [make_raw(f"Org {i}", record_id=str(i)) for i in range(3)] + [{"organization": 1}]
+    records = LazyRecords(raws)
+    assert len(records) == 4
+    assert records[1].organization == "Org 1"
+    with pytest.raises(RecordValidationError):
+        records[3]
+
+    del records[3]
+    records[0].executive_name = "Changed"
+    records.append(ClientRecord(organization="New"))
+    out = records.to_raw()
+    assert [r["organization"] for r in out] == ["Org 0", "Org 1", "Org 2", "New"]
+    assert out[0]["executive_name"] == "Changed"
+    assert out[2] is raws[2]
@@ -0,0 +1,112 @@
+import copy
+import json
+
+import pytest
+
+from utils import version_history
+
+PAIRS = [
+    ({"a": 1}, {"a": 2}),
+    ({"a": 1, "b": 2}, {"a": 1}),
+    ({"a": 1}, {"a": 1, "b": {"c": [1, 2]}}),
+    ({"a": [1, 2, 3]}, {"a": [1, 2]}),
+    ({"a": [1]}, {"a": [1, 2, 3]}),
+    ({"a": [{"x": 1}, {"x": 2}]}, {"a": [{"x": 1}, {"x": 3, "y": None}]}),
+    ({"a": {"b": 1}}, {"a": [1]}),
+    ({"a": None}, {"a": ""}),
+    ({"a": list(range(20))}, {"a": [0]}),
+]
+
+
+@pytest.mark.parametrize("old, new", PAIRS)
+def test_apply_delta_reproduces_diff_target(old, new):
+    before = copy.deepcopy(old)
+    assert version_history.apply_delta(old, version_history.diff(old, new)) == new
+    assert old == before
+
+
+def test_diff_of_equal_documents_is_empty():
+    doc = {"a": [1, {"b": "c"}], "d": None}
+    assert version_history.diff(doc, copy.deepcopy(doc)) == []
+
+
+def test_apply_delta_shares_untouched_subtrees():
+    old = {"changed": {"x": 1}, "untouched": {"big": [1, 2, 3]}}
+    new = version_history.apply_delta(old, [["set", ["changed", "x"], 2]])
+    assert new["changed"] == {"x": 2} and old["changed"] == {"x": 1}
+    assert new["untouched"] is old["untouched"]
+
+
+def _state(history_dir, version):
+    # get_version stamps the requested version on the state it returns
+    record = version_history.get_version(str(history_dir), "r1", version)
+    return version_history._strip(record) if record is not None else None
+
+
+def _states(count):
+    states = []
+    doc = {"organization": "Acme", "brands": [{"name": "A", "n": 0}], "notes": []}
+    for i in range(count):
+        doc = copy.deepcopy(doc)
+        doc["brands"][0]["n"] = i
+        if i % 3 == 0:
+            doc["notes"].append(f"note {i}")
+        if i % 7 == 0:
+            doc["brands"].append({"name": f"B{i}"})
+        if i % 11 == 0:
+            doc["notes"] = doc["notes"][:1]
+        states.append(doc)
+    return states
+
+
+def test_every_version_replays_to_its_state(tmp_path):
+    states = _states(25)
+    for v, state in enumerate(states, start=1):
+        version_history.append_version(str(tmp_path), "r1", v, dict(state, version=v),
+                                       op="create" if v == 1 else "update")
+    lines = version_history._read_lines(str(tmp_path), "r1")
+    checkpoints = [json.loads(line)["v"] for line in lines if "checkpoint" in json.loads(line)]
+    assert checkpoints[:3] == [1, 11, 21]
+    for v, state in enumerate(states, start=1):
+        assert _state(tmp_path, v) == state
+    assert version_history.latest_version(str(tmp_path), "r1") == 25
+    assert version_history.get_version(str(tmp_path), "r1", 26) is None
+
+
+def test_compact_keeps_states_and_trims_old_versions(tmp_path):
+    states = _states(25)
+    for v, state in enumerate(states, start=1):
+        version_history.append_version(str(tmp_path), "r1", v, state)
+
+    version_history.compact(str(tmp_path), "r1")
+    for v, state in enumerate(states, start=1):
+        assert _state(tmp_path, v) == state
+
+    version_history.compact(str(tmp_path), "r1", keep=5)
+    assert [e["version"] for e in version_history.list_versions(str(tmp_path), "r1")] == [21, 22, 23, 24, 25]
+    assert version_history.get_version(str(tmp_path), "r1", 20) is None
+    for v in range(21, 26):
+        assert _state(tmp_path, v) == states[v - 1]
+
+
+def test_last_entry_wins_for_a_version_logged_twice(tmp_path):
+    version_history.append_version(str(tmp_path), "r1", 1, {"a": 1})
+    version_history.append_version(str(tmp_path), "r1", 2, {"a": 2})
+    version_history.append_version(str(tmp_path), "r1", 2, {"a": 3})
+    assert _state(tmp_path, 2) == {"a": 3}
+    assert _state(tmp_path, 1) == {"a": 1}
+
+
+def test_delete_marker_keeps_the_last_state(tmp_path):
+    version_history.append_version(str(tmp_path), "r1", 1, {"a": 1}, op="create")
+    version_history.append_marker(str(tmp_path), "r1", 2, "delete")
+    assert _state(tmp_path, 2) == {"a": 1}
+    assert [e["op"] for e in version_history.list_versions(str(tmp_path), "r1")] == ["create", "delete"]
+
+
+def test_last_modified_skips_seeded_history_but_not_imports(tmp_path):
+    version_history.append_version(str(tmp_path), "r1", 1, {"a": 1}, op="seed")
+    assert version_history.last_modified(str(tmp_path), "r1") is None
+    version_history.append_version(str(tmp_path), "r1", 2, {"a": 2}, op="import")
+    imported = version_history.last_modified(str(tmp_path), "r1")
+    assert imported == version_history.list_versions(str(tmp_path), "r1")[-1]["timestamp"]
@@ -0,0 +1,318 @@
+import gzip
+import json
+import os
+from datetime import date, datetime
+
+from utils import data_manager, version_history
+from utils.models import ClientRecord
+
+# Cold storage for records that are rarely opened (old pitches, inactive
+# clients). An archive run moves every record matching one of the policies out
+# of the hot store into a new gzip-compressed JSON Lines segment under
+# <data_dir>/cold/. The manifest (cold/manifest.json) lists the segments and,
+# per archived record, its segment plus the fields needed to search it
+# (organization, type, date, brand names), so searching never decompresses a
+# segment; only opening or restoring a record does. The manifest also keeps
+# the version that was archived: a record saved while the run was writing
+# its segment stays in the hot store, and its stale cold copy is dropped
+# from the manifest.
+#
+# A policy is a dict; a record matches when it meets every condition given:
+#   name             label shown in summaries
+#   types            record types, e.g. ["pitch"]
+#   older_than_days  age of the record date (date_field) in days
+#   date_field       "presentation_date", "onboard_date" or "date" (either, default)
+#   inactive_days    days since the record last changed (history log, else created_at)
+# Policies are kept in <data_dir>/archive_policies.json; DEFAULT_POLICIES
+# applies until that file exists.
+
+DEFAULT_POLICIES = [
+    {"name": "Old pitches", "types": ["pitch"], "older_than_days": 365},
+    {"name": "Inactive clients", "types": ["onboard"], "inactive_days": 730},
+]
+
+POLICY_CONDITIONS = ("types", "older_than_days", "inactive_days")
+DATE_FIELDS = ("date", "presentation_date", "onboard_date")
+
+
+def cold_dir():
+    return os.path.join(data_manager.DATA_DIR, "cold")
+
+
+def _manifest_path():
+    return os.path.join(cold_dir(), "manifest.json")
+
+
+def _policy_path():
+    return os.path.join(data_manager.DATA_DIR, "archive_policies.json")
+
+
+def load_manifest():
+    path = _manifest_path()
+    if not os.path.exists(path):
+        return {"segments": {}, "records": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest):
+    path = _manifest_path()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+# --- Policies -----------------------------------------------------------------
+
+def validate_policy(policy):
+    """Raises ValueError for a policy that would match nothing or everything."""
+    if not any(policy.get(k) for k in POLICY_CONDITIONS):
+        raise ValueError(f"Policy {policy.get('name', '')!r} needs at least one of: {', '.join(POLICY_CONDITIONS)}")
+    if policy.get("date_field", "date") not in DATE_FIELDS:
+        raise ValueError(f"Unknown date_field: {policy['date_field']}")
+    for key in ("older_than_days", "inactive_days"):
+        if key in policy and policy[key] is not None and int(policy[key]) < 0:
+            raise ValueError(f"{key} must not be negative")
+
+
+def load_policies():
+    path = _policy_path()
+    if not os.path.exists(path):
+        return [dict(p) for p in DEFAULT_POLICIES]
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_policies(policies):
+    for policy in policies:
+        validate_policy(policy)
+    data_manager.ensure_data_file()
+    with open(_policy_path(), "w") as f:
+        json.dump(policies, f, indent=4)
+
+
+def _parse_day(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)).date()
+    except ValueError:
+        return None
+
+
+def _record_day(raw, field):
+    if field == "date":
+        return _parse_day(raw.get("presentation_date") or raw.get("onboard_date"))
+    return _parse_day(raw.get(field))
+
+
+def _last_activity(raw):
+    ts = version_history.last_modified(data_manager.HISTORY_DIR, raw.get("id"))
+    return _parse_day(ts or raw.get("created_at"))
+
+
+def matching_policy(raw, policies, today=None):
+    """Returns the name of the first policy the record matches, or None."""
+    today = today or date.today()
+    for policy in policies:
+        types = policy.get("types")
+        if types and raw.get("type") not in types:
+            continue
+        if policy.get("older_than_days") is not None:
+            day = _record_day(raw, policy.get("date_field", "date"))
+            if day is None or (today - day).days < int(policy["older_than_days"]):
+                continue
+        if policy.get("inactive_days") is not None:
+            day = _last_activity(raw)
+            if day is None or (today - day).days < int(policy["inactive_days"]):
+                continue
+        return policy.get("name") or "policy"
+    return None
+
+
+# --- Archive / search / restore -----------------------------------------------
+
+def _cold_entry(raw, segment, policy_name):
+    return {
+        "segment": segment,
+        "organization": raw.get("organization"),
+        "type": raw.get("type"),
+        "date": raw.get("presentation_date") or raw.get("onboard_date"),
+        "brands": [b.get("name") for b in raw.get("brands", [])],
+        "version": raw.get("version", 1),
+        "archived_at": datetime.now().isoformat(),
+        "policy": policy_name,
+    }
+
+
+def archive(policies=None, dry_run=False, today=None):
+    """
+    Moves every hot record matching a policy into a new cold segment.
+    The segment and manifest are written before the records leave the hot
+    store, so an interrupted run can only leave a record in both tiers (the
+    hot copy wins), never in neither. Records saved after they were read
+    are left in the hot store. Returns a summary dict.
+    """
+    policies = load_policies() if policies is None else policies
+    for policy in policies:
+        validate_policy(policy)
+    data_manager.ensure_data_file()
+
+    summary = {"scanned": 0, "archived": 0, "changed_during_run": 0, "by_policy": {}, "segment": None,
+               "hot_bytes_before": os.path.getsize(data_manager.DATA_FILE)}
+    segment = f"segment-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.jsonl.gz"
+    segment_path = os.path.join(cold_dir(), segment)
+    manifest = load_manifest()
+    archived = {}
+    out = None
+
+    try:
+        for raw in data_manager.iter_raw():
+            summary["scanned"] += 1
+            if not raw.get("id") or raw["id"] in manifest["records"]:
+                continue
+            name = matching_policy(raw, policies, today)
+            if name is None:
+                continue
+            summary["by_policy"][name] = summary["by_policy"].get(name, 0) + 1
+            archived[raw["id"]] = _cold_entry(raw, segment, name)
+            if dry_run:
+                continue
+            if out is None:
+                os.makedirs(cold_dir(), exist_ok=True)
+                out = gzip.open(segment_path, "wt", encoding="utf-8")
+            out.write(json.dumps(raw, separators=(",", ":")) + "\n")
+    finally:
+        if out is not None:
+            out.close()
+
+    summary["archived"] = len(archived)
+    if dry_run or not archived:
+        return summary
+
+    manifest["segments"][segment] = {
+        "created": datetime.now().isoformat(),
+        "records": len(archived),
+        "bytes": os.path.getsize(segment_path),
+    }
+    manifest["records"].update(archived)
+    _save_manifest(manifest)
+    removed = set(data_manager.remove_records({rid: entry["version"] for rid, entry in archived.items()}))
+
+    # Records edited since the scan stay hot; forget their stale cold copies
+    changed = [rid for rid in archived if rid not in removed]
+    if changed:
+        for record_id in changed:
+            del manifest["records"][record_id]
+            summary["by_policy"][archived[record_id]["policy"]] -= 1
+        if removed:
+            manifest["segments"][segment]["records"] = len(removed)
+        else:
+            del manifest["segments"][segment]
+            os.remove(segment_path)
+        _save_manifest(manifest)
+    summary["archived"] = len(removed)
+    summary["changed_during_run"] = len(changed)
+    summary["hot_bytes_after"] = os.path.getsize(data_manager.DATA_FILE)
+    if not removed:
+        return summary
+
+    summary["segment"] = segment
+    summary["cold_bytes"] = os.path.getsize(segment_path)
+    return summary
+
+
+def search(text="", types=None, date_from=None, date_to=None, limit=None):
+    """
+    Finds cold records by organization or brand name (case-insensitive
+    substring), type and date range, from the manifest alone. Returns a list
+    of dicts with the record id and its manifest fields.
+    """
+    text = (text or "").strip().lower()
+    date_from, date_to = str(date_from or ""), str(date_to or "")
+    results = []
+    for record_id, entry in load_manifest()["records"].items():
+        if types and entry.get("type") not in types:
+            continue
+        day = entry.get("date") or ""
+        if (date_from and day < date_from) or (date_to and day > date_to):
+            continue
+        if text:
+            names = [entry.get("organization") or ""] + [b or "" for b in entry.get("brands", [])]
+            if not any(text in name.lower() for name in names):
+                continue
+        results.append(dict(entry, id=record_id))
+        if limit and len(results) >= limit:
+            break
+    return results
+
+
+def _read_segment(segment):
+    with gzip.open(os.path.join(cold_dir(), segment), "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def get_raw(record_id):
+    """Decompresses the record's segment up to the record; returns a dict or None."""
+    entry = load_manifest()["records"].get(record_id)
+    if entry is None:
+        return None
+    return next((r for r in _read_segment(entry["segment"]) if r.get("id") == record_id), None)
+
+
+def get_record(record_id):
+    raw = get_raw(record_id)
+    return ClientRecord.from_dict(raw) if raw is not None else None
+
+
+def restore(record_id):
+    """
+    Moves a cold record back into the hot store with its id, version and
+    history unchanged. Returns the restored record, or None if it is not archived.
+    """
+    manifest = load_manifest()
+    entry = manifest["records"].get(record_id)
+    if entry is None:
+        return None
+    segment = entry["segment"]
+    remaining = []
+    restored = None
+    for raw in _read_segment(segment):
+        if raw.get("id") == record_id:
+            restored = raw
+        elif manifest["records"].get(raw.get("id"), {}).get("segment") == segment:
+            # Copies no longer in the manifest (edited during their run) are dropped
+            remaining.append(raw)
+    if restored is None:
+        return None
+
+    # A hot copy left by an interrupted archive run is newer; keep it
+    if data_manager.get_raw(record_id) is None:
+        data_manager.put_raw(restored)
+
+    segment_path = os.path.join(cold_dir(), segment)
+    if remaining:
+        tmp_path = segment_path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for raw in remaining:
+                f.write(json.dumps(raw, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, segment_path)
+        manifest["segments"][segment].update(records=len(remaining), bytes=os.path.getsize(segment_path))
+    else:
+        os.remove(segment_path)
+        manifest["segments"].pop(segment, None)
+    del manifest["records"][record_id]
+    _save_manifest(manifest)
+    return ClientRecord.from_dict(restored)
+
+
+def stats():
+    manifest = load_manifest()
+    return {
+        "cold_records": len(manifest["records"]),
+        "cold_segments": len(manifest["segments"]),
+        "cold_bytes": sum(s.get("bytes", 0) for s in manifest["segments"].values()),
+    }
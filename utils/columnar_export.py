@@ -0,0 +1,174 @@
+import io
+import os
+import tempfile
+import zipfile
+from utils.models import PLATFORM_ACCESS_KEYS
+
+# Columnar export of the whole portfolio for BI tools.
+#
+# Records are streamed from data_manager and normalized into one table per
+# entity. Rows are buffered per table and flushed to the file as Arrow record
+# batches every `batch_size` rows, so memory stays bounded by the batch size
+# rather than the portfolio size.
+#
+# Every table is keyed by record_id (plus brand_index / competitor_index for
+# nested rows) so they can be joined back together.
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Columnar export needs pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def _schemas(pa):
+    string, int32 = pa.string(), pa.int32()
+    return {
+        "organizations": pa.schema([
+            ("record_id", string), ("organization", string), ("executive_name", string),
+            ("type", string), ("onboard_date", string), ("presentation_date", string),
+            ("created_at", string), ("version", pa.int64()), ("reports", pa.list_(string)),
+        ]),
+        "brands": pa.schema([
+            ("record_id", string), ("brand_index", int32), ("brand_name", string),
+            ("google_trends_link", string), ("google_trends_search_terms", string),
+            ("web_traffic_competitors", pa.list_(string)), ("social_listening_enabled", pa.bool_()),
+        ]),
+        "competitors": pa.schema([
+            ("record_id", string), ("brand_index", int32), ("competitor_index", int32),
+            ("competitor_name", string),
+        ]),
+        # competitor_index is null for the brand's own social links
+        "socials": pa.schema([
+            ("record_id", string), ("brand_index", int32), ("competitor_index", int32),
+            ("platform", string), ("link", string),
+        ]),
+        "keywords": pa.schema([("record_id", string), ("brand_index", int32), ("keyword", string)]),
+        "hashtags": pa.schema([("record_id", string), ("brand_index", int32), ("hashtag", string)]),
+        "platform_access": pa.schema([
+            ("record_id", string), ("brand_index", int32), ("platform", string), ("details", string),
+        ]),
+    }
+
+
+def _normalize(record):
+    # Yields (table, row) pairs for one ClientRecord
+    rid = record.id
+    yield "organizations", (
+        rid, record.organization, record.executive_name, record.type, record.onboard_date,
+        record.presentation_date, record.created_at, record.version, list(record.reports),
+    )
+
+    for bi, brand in enumerate(record.brands):
+        data = brand.data
+        gt, wt, sl = data.google_trends, data.web_traffic, data.social_listening
+        yield "brands", (
+            rid, bi, brand.name,
+            gt.link if gt else None, gt.search_terms if gt else None,
+            list(wt.selected_competitors) if wt else None,
+            sl.enabled if sl else None,
+        )
+
+        ca = data.competitor_analysis
+        if ca:
+            for platform, link in ca.brand_socials.items():
+                yield "socials", (rid, bi, None, platform, link)
+            for ci, comp in enumerate(ca.competitors):
+                yield "competitors", (rid, bi, ci, comp.name)
+                for platform, link in comp.socials.items():
+                    yield "socials", (rid, bi, ci, platform, link)
+
+        if sl and sl.brand_health:
+            for kw in sl.brand_health.keywords:
+                yield "keywords", (rid, bi, kw)
+            for ht in sl.brand_health.hashtags:
+                yield "hashtags", (rid, bi, ht)
+
+        for key in PLATFORM_ACCESS_KEYS:
+            details = getattr(data, key)
+            if details is not None:
+                yield "platform_access", (rid, bi, key, details)
+
+
+class _TableWriter:
+    def __init__(self, pa, fmt, path, schema, batch_size):
+        self.pa = pa
+        self.schema = schema
+        self.batch_size = batch_size
+        self.columns = [[] for _ in schema.names]
+        self.rows = 0
+        if fmt == "parquet":
+            self.writer = pa.parquet.ParquetWriter(path, schema, compression="zstd")
+        else:
+            self.sink = pa.OSFile(path, "wb")
+            self.writer = pa.ipc.new_file(self.sink, schema)
+
+    def append(self, row):
+        for column, value in zip(self.columns, row):
+            column.append(value)
+        self.rows += 1
+        if len(self.columns[0]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.columns[0]:
+            return
+        batch = self.pa.RecordBatch.from_arrays(
+            [self.pa.array(col, type=field.type) for col, field in zip(self.columns, self.schema)],
+            schema=self.schema,
+        )
+        self.writer.write_batch(batch)
+        self.columns = [[] for _ in self.schema.names]
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        if hasattr(self, "sink"):
+            self.sink.close()
+
+
+def export_portfolio(dest_dir, fmt="parquet", records=None, batch_size=10000):
+    """
+    Writes the normalized portfolio tables to dest_dir as Parquet or Arrow IPC
+    files. `records` defaults to streaming every stored record from
+    data_manager. Returns {table_name: (path, row_count)}.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    pa = _pyarrow()
+    if records is None:
+        from utils import data_manager
+        records = data_manager.iter_records()
+
+    os.makedirs(dest_dir, exist_ok=True)
+    writers = {
+        name: _TableWriter(pa, fmt, os.path.join(dest_dir, name + FORMATS[fmt]), schema, batch_size)
+        for name, schema in _schemas(pa).items()
+    }
+    try:
+        for record in records:
+            for table, row in _normalize(record):
+                writers[table].append(row)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return {name: (os.path.join(dest_dir, name + FORMATS[fmt]), w.rows) for name, w in writers.items()}
+
+
+def export_portfolio_zip(fmt="parquet", records=None, batch_size=10000):
+    """Same as export_portfolio, packed into a zip archive in memory (for downloads)."""
+    buffer = io.BytesIO()
+    with tempfile.TemporaryDirectory() as tmp:
+        tables = export_portfolio(tmp, fmt=fmt, records=records, batch_size=batch_size)
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zf:
+            for path, _ in tables.values():
+                zf.write(path, os.path.basename(path))
+    buffer.seek(0)
+    return buffer
@@ -1,67 +1,665 @@
 import json
 import os
-import pandas as pd
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from utils import jsonl_store, name_index, query_index, version_history
+from utils.models import ClientRecord, LazyRecords
 
-DATA_FILE = "data/clients.json"
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, saves are not serialized
+    fcntl = None
+
+# Storage formats:
+#   json   one JSON array in clients.json, rewritten on every save
+#   jsonl  one record per line in clients.jsonl plus a sidecar offset index
+#          (see utils/jsonl_store.py); reads parse only the records they need
+#          and saves append a single line
+STORAGE_FORMATS = {"json": "clients.json", "jsonl": "clients.jsonl"}
+
+DATA_DIR = os.environ.get("CLIENTS_DATA_DIR", "data")
+STORAGE_FORMAT = os.environ.get("CLIENTS_STORAGE_FORMAT", "json")
+DATA_FILE = os.path.join(DATA_DIR, STORAGE_FORMATS[STORAGE_FORMAT])
+HISTORY_DIR = os.path.join(DATA_DIR, "history")
+
+def configure(data_dir=None, storage_format=None):
+    """Points data_manager at another data directory and/or storage format (CLI, benchmarks, tools)."""
+    global DATA_DIR, DATA_FILE, HISTORY_DIR, STORAGE_FORMAT
+    if storage_format is not None:
+        if storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"Unknown storage format: {storage_format}")
+        STORAGE_FORMAT = storage_format
+    DATA_DIR = data_dir or DATA_DIR
+    DATA_FILE = os.path.join(DATA_DIR, STORAGE_FORMATS[STORAGE_FORMAT])
+    HISTORY_DIR = os.path.join(DATA_DIR, "history")
+
+def _jsonl():
+    return STORAGE_FORMAT == "jsonl"
+
+# Held by the thread inside _store_lock(); makes the lock re-entrant and
+# serializes the Streamlit sessions (threads) of one process
+_thread_lock = threading.RLock()
+_lock_depth = 0
+
+@contextmanager
+def _store_lock():
+    # Serializes read-check-write sequences on the store across threads and
+    # processes (Streamlit sessions, CLI runs) with an advisory lock beside
+    # the store. Every writer takes it; nested calls reuse the outer lock.
+    global _lock_depth
+    ensure_data_file()
+    with _thread_lock:
+        if _lock_depth or fcntl is None:
+            _lock_depth += 1
+            try:
+                yield
+            finally:
+                _lock_depth -= 1
+            return
+        with open(DATA_FILE + ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            _lock_depth += 1
+            try:
+                yield
+            finally:
+                _lock_depth -= 1
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+def _temp_file():
+    # A unique file beside the store, to be swapped in with os.replace
+    fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, prefix=os.path.basename(DATA_FILE) + ".", suffix=".tmp")
+    os.chmod(tmp_path, 0o644)
+    return fd, tmp_path
+
+def store_lock():
+    """
+    Context manager holding the lock every writer takes. For batch jobs that
+    rewrite the store themselves (cli.py import), so saves made meanwhile
+    wait instead of being lost.
+    """
+    return _store_lock()
 
 def ensure_data_file():
-    if not os.path.exists("data"):
-        os.makedirs("data")
+    if not os.path.exists(DATA_DIR):
+        os.makedirs(DATA_DIR, exist_ok=True)
     if not os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "w") as f:
+        # Never truncate: another process may have created and filled the
+        # store since the check above
+        if _jsonl():
+            open(DATA_FILE, "a").close()
+            return
+        fd, tmp_path = _temp_file()
+        with os.fdopen(fd, "w") as f:
             json.dump([], f)
+        try:
+            os.link(tmp_path, DATA_FILE)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
 
-def load_data():
+def load_raw():
+    """Returns the stored records as plain dicts, exactly as they are on disk."""
     ensure_data_file()
+    if _jsonl():
+        return list(jsonl_store.iter_raw(DATA_FILE))
     try:
         with open(DATA_FILE, "r") as f:
             return json.load(f)
     except json.JSONDecodeError:
         return []
 
-def save_data(data):
+def _load_for_update():
+    # Like load_raw, but an unreadable json store raises instead of reading
+    # as empty, so a writer never saves over records it could not parse
+    ensure_data_file()
+    with open(DATA_FILE, "r") as f:
+        return json.load(f)
+
+def save_raw(data):
+    save_raw_stream(data)
+
+def iter_json_array(f, chunk_size=1 << 16):
+    # Yields the elements of a top-level JSON array one at a time, holding at
+    # most one element plus one chunk of the file in memory.
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size)
+    pos = 0
+    eof = not buf
+
+    def skip(chars):
+        nonlocal buf, pos, eof
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+
+    skip(" \t\r\n")
+    if eof:
+        return
+    if buf[pos] != "[":
+        raise json.JSONDecodeError("Expected a JSON array", buf, pos)
+    pos += 1
+
+    while True:
+        skip(" \t\r\n,")
+        if eof:
+            raise json.JSONDecodeError("Unterminated JSON array", buf, pos)
+        if buf[pos] == "]":
+            return
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                break
+            except json.JSONDecodeError:
+                more = f.read(chunk_size)
+                if not more:
+                    raise
+                buf, pos = buf[pos:] + more, 0
+        yield obj
+        buf, pos = buf[end:], 0
+
+def iter_raw():
+    """Streams the stored records as dicts without loading the whole file."""
     ensure_data_file()
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    if _jsonl():
+        yield from jsonl_store.iter_raw(DATA_FILE)
+        return
+    with open(DATA_FILE, "r") as f:
+        yield from iter_json_array(f)
+
+def iter_records():
+    """Streams the stored records as ClientRecord objects."""
+    for raw in iter_raw():
+        yield ClientRecord.from_dict(raw)
+
+def save_raw_stream(records):
+    """
+    Writes an iterable of raw records as the new store, one record at a time,
+    in the same layout as save_raw. The file is replaced atomically once
+    everything is written, so records may be streamed from iter_raw() itself.
+    Returns the number of records written.
+    """
+    ensure_data_file()
+    if _jsonl():
+        return jsonl_store.rewrite(DATA_FILE, records)
+    fd, tmp_path = _temp_file()
+    count = 0
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write("[")
+            for record in records:
+                f.write(",\n    " if count else "\n    ")
+                f.write(json.dumps(record, indent=4).replace("\n", "\n    "))
+                count += 1
+            f.write("\n]" if count else "]")
+        os.replace(tmp_path, DATA_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return count
+
+def _encode(record):
+    return record.to_dict() if isinstance(record, ClientRecord) else record
+
+def load_data():
+    """All stored records as a list of ClientRecords, each decoded on first access."""
+    return LazyRecords(load_raw())
+
+def save_data(data):
+    if isinstance(data, LazyRecords):
+        save_raw(data.to_raw())
+        return
+    save_raw([_encode(r) for r in data])
 
 def add_client_record(record):
-    data = load_data()
+    """
+    Stores a new record (a ClientRecord or a dict in the stored format) and
+    returns it as a ClientRecord with its id, timestamp and version set.
+    """
+    if isinstance(record, dict):
+        record = ClientRecord.from_dict(record)
     # Add a unique ID and timestamp if not present
-    if "id" not in record:
-        record["id"] = datetime.now().strftime("%Y%m%d%H%M%S%f")
-    if "created_at" not in record:
-        record["created_at"] = datetime.now().isoformat()
+    if record.id is None:
+        record.id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    if record.created_at is None:
+        record.created_at = datetime.now().isoformat()
+    record.version = 1
     
-    data.append(record)
-    save_data(data)
+    raw = record.to_dict()
+    with _store_lock():
+        if _jsonl():
+            jsonl_store.put(DATA_FILE, raw)
+        else:
+            data = _load_for_update()
+            data.append(raw)
+            save_raw(data)
+        version_history.append_version(HISTORY_DIR, record.id, 1, raw, op="create")
+    return record
+
+def update_client_record(updated_record, check_version=True):
+    """
+    Saves an edited record as its next version. With check_version the save
+    is refused when the stored record is no longer at the version the record
+    was read at (someone saved it in the meantime), so their change is not
+    silently overwritten. Returns True if the record was saved.
+    """
+    if isinstance(updated_record, dict):
+        updated_record = ClientRecord.from_dict(updated_record)
+    expected = None
+    if check_version and updated_record.version is not None:
+        expected = {updated_record.id: updated_record.version}
+    updated, _ = update_client_records([updated_record], expected_versions=expected)
+    return bool(updated)
+
+def update_client_records(records, expected_versions=None, op="update"):
+    """
+    Updates several records with one write to the store. expected_versions
+    ({id: version}) guards against overwriting changes saved since the
+    caller read the records: those records are skipped and returned as
+    conflicts. op is the operation logged in their history.
+    Returns (updated ids, conflicting ids).
+    """
+    records = [ClientRecord.from_dict(r) if isinstance(r, dict) else r for r in records]
+    with _store_lock():
+        return _update_records(records, expected_versions or {}, op)
+
+def _update_records(records, expected_versions, op):
+    wanted = {r.id: r for r in records}
+    stored = {}
+    if _jsonl():
+        for record_id in wanted:
+            raw = get_raw(record_id)
+            if raw is not None:
+                stored[record_id] = raw
+        data = None
+    else:
+        data = _load_for_update()
+        for raw in data:
+            if raw.get("id") in wanted:
+                stored[raw["id"]] = raw
 
-def update_client_record(updated_record):
-    data = load_data()
-    for i, record in enumerate(data):
-        if record.get("id") == updated_record.get("id"):
-            data[i] = updated_record
-            break
-    save_data(data)
+    updated, conflicts, new_raws = [], [], {}
+    for record_id, record in wanted.items():
+        old = stored.get(record_id)
+        version = old.get("version", 1) if old is not None else None
+        if old is None or (record_id in expected_versions and expected_versions[record_id] != version):
+            conflicts.append(record_id)
+            continue
+        record.version = version + 1
+        new_raws[record_id] = record.to_dict()
+        updated.append(record_id)
+
+    if new_raws:
+        if _jsonl():
+            jsonl_store.put_many(DATA_FILE, list(new_raws.values()))
+        else:
+            save_raw([new_raws.get(raw.get("id"), raw) for raw in data])
+        for record_id, raw in new_raws.items():
+            version_history.append_version(HISTORY_DIR, record_id, raw["version"], raw, old_record=stored[record_id], op=op)
+    return updated, conflicts
 
 def delete_client_record(record_id):
-    data = load_data()
-    data = [r for r in data if r.get("id") != record_id]
-    save_data(data)
+    with _store_lock():
+        if _jsonl():
+            deleted = get_raw(record_id)
+            if deleted is not None:
+                jsonl_store.delete(DATA_FILE, record_id)
+        else:
+            data = _load_for_update()
+            deleted = next((r for r in data if r.get("id") == record_id), None)
+            if deleted is not None:
+                save_raw([r for r in data if r.get("id") != record_id])
+        if deleted:
+            version = deleted.get("version", 1)
+            if version_history.latest_version(HISTORY_DIR, record_id) is None:
+                # Keep the deleted state restorable for records without history yet
+                version_history.append_version(HISTORY_DIR, record_id, version, deleted, op="seed")
+            version_history.append_marker(HISTORY_DIR, record_id, version + 1, "delete")
 
 def get_all_organizations():
-    data = load_data()
-    return list(set([r.get("organization") for r in data if "organization" in r]))
+    if _jsonl():
+        # Straight from the offset index; no record is read
+        ensure_data_file()
+        return jsonl_store.organizations(DATA_FILE)
+    data = load_raw()
+    return sorted(set([r.get("organization") for r in data if r.get("organization")]), key=str.casefold)
 
 def get_brands_for_org(org_name):
-    data = load_data()
+    if _jsonl():
+        ensure_data_file()
+        data = jsonl_store.iter_by_org(DATA_FILE, org_name)
+    else:
+        data = load_raw()
     brands = []
     for r in data:
         if r.get("organization") == org_name:
             brands.extend([b["name"] for b in r.get("brands", [])])
+    return brands
+
+def get_raw(record_id):
+    """Returns one stored record as a dict, or None."""
+    if _jsonl():
+        ensure_data_file()
+        return jsonl_store.get(DATA_FILE, record_id)
+    return next((r for r in iter_raw() if r.get("id") == record_id), None)
+
+def get_record(record_id):
+    raw = get_raw(record_id)
+    return ClientRecord.from_dict(raw) if raw is not None else None
+
 def get_record_by_org(org_name):
-    data = load_data()
+    if _jsonl():
+        # Decodes only the matching line of the memory-mapped store
+        ensure_data_file()
+        raw = jsonl_store.get_by_org(DATA_FILE, org_name)
+        return ClientRecord.from_dict(raw) if raw is not None else None
+    data = load_raw()
     for r in data:
         if r.get("organization") == org_name:
-            return r
+            return ClientRecord.from_dict(r)
     return None
+
+def get_records_by_org(org_name):
+    if _jsonl():
+        ensure_data_file()
+        return [ClientRecord.from_dict(r) for r in jsonl_store.iter_by_org(DATA_FILE, org_name)]
+    return [ClientRecord.from_dict(r) for r in iter_raw() if r.get("organization") == org_name]
+
+def put_raw(raw):
+    """
+    Stores a raw record exactly as given, replacing a stored record with the
+    same id. Versions and history are left alone (used to move records
+    between storage tiers, see utils/archive.py).
+    """
+    with _store_lock():
+        if _jsonl():
+            jsonl_store.put(DATA_FILE, raw)
+            return
+        data = _load_for_update()
+        for i, record in enumerate(data):
+            if record.get("id") == raw.get("id"):
+                data[i] = raw
+                break
+        else:
+            data.append(raw)
+        save_raw(data)
+
+def remove_records(expected_versions):
+    """
+    Drops records without touching their history (used to move records
+    between storage tiers, see utils/archive.py). expected_versions maps each
+    id to the version the caller read; a record saved since then is kept.
+    Returns the ids that were removed.
+    """
+    with _store_lock():
+        if _jsonl():
+            removed = []
+            for record_id, version in expected_versions.items():
+                raw = get_raw(record_id)
+                if raw is not None and raw.get("version", 1) == version:
+                    removed.append(record_id)
+            # Tombstones, so lines other processes append meanwhile are kept
+            if removed:
+                jsonl_store.delete_many(DATA_FILE, removed)
+            return removed
+        data = _load_for_update()
+        removed = [r["id"] for r in data
+                   if r.get("id") in expected_versions and r.get("version", 1) == expected_versions[r["id"]]]
+        if removed:
+            dropped = set(removed)
+            save_raw([r for r in data if r.get("id") not in dropped])
+        return removed
+
+# Queries
+# Filtered lookups go through secondary indexes (utils/query_index.py) on
+# type, executive, date, reports and social listening. With the jsonl format
+# they live in the store's sidecar index, are updated from the appended lines
+# on every write and read records by offset. With the json format the whole
+# file has to be parsed anyway, so the parsed records and their indexes are
+# kept until the file changes.
+
+_json_snapshot = None
+
+def _json_query_snapshot():
+    global _json_snapshot
+    ensure_data_file()
+    st = os.stat(DATA_FILE)
+    signature = (DATA_FILE, st.st_mtime_ns, st.st_size)
+    if _json_snapshot is None or _json_snapshot[0] != signature:
+        by_id = {}
+        index = query_index.QueryIndex()
+        for i, raw in enumerate(iter_raw()):
+            record_id = raw.get("id") or f"#{i}"
+            by_id[record_id] = raw
+            index.add(record_id, query_index.fields(raw))
+        _json_snapshot = (signature, by_id, index)
+    return _json_snapshot
+
+def query(type=None, executive=None, date_from=None, date_to=None, report=None, has_social_listening=None):
+    """
+    Lazily yields the ClientRecords matching every given filter, in store
+    order. type, executive and report take a value or a list of values (any
+    of); date_from/date_to bound the presentation or onboard date (inclusive,
+    ISO strings or dates); has_social_listening checks whether any brand has
+    social listening enabled. Only the matching records are decoded.
+    """
+    filters = dict(type=type, executive=executive, date_from=date_from, date_to=date_to,
+                   report=report, has_social_listening=has_social_listening)
+    if _jsonl():
+        ensure_data_file()
+        for raw in jsonl_store.query(DATA_FILE, **filters):
+            yield ClientRecord.from_dict(raw)
+        return
+    _, by_id, index = _json_query_snapshot()
+    for record_id in index.query(**filters):
+        yield ClientRecord.from_dict(by_id[record_id])
+
+def query_ids(**filters):
+    """Ids of the records query() would yield, from the indexes alone."""
+    if _jsonl():
+        ensure_data_file()
+        return jsonl_store.query_ids(DATA_FILE, **filters)
+    return _json_query_snapshot()[2].query(**filters)
+
+def query_facets():
+    """Distinct types, executives and reports plus the date range, for filter widgets."""
+    if _jsonl():
+        ensure_data_file()
+        return jsonl_store.facets(DATA_FILE)
+    return _json_query_snapshot()[2].facets()
+
+# Name lookup
+# Typeahead search and duplicate detection over organization and brand names
+# (utils/name_index.py). The index is kept next to the query indexes: in the
+# jsonl sidecar index, or with the parsed json snapshot.
+
+_json_names = None
+
+def _name_index():
+    # json format only; the jsonl index is searched through jsonl_store
+    global _json_names
+    signature, by_id, _ = _json_query_snapshot()
+    if _json_names is None or _json_names[0] != signature:
+        index = name_index.NameIndex()
+        for record_id, raw in by_id.items():
+            index.add(record_id, raw.get("organization"), [b.get("name") for b in raw.get("brands", [])])
+        _json_names = (signature, index)
+    return _json_names[1]
+
+def search_organizations(text, limit=20):
+    """
+    Organizations matching typed text by name or brand name, prefix matches
+    first, then fuzzy ones. Returns dicts with organization, match (the name
+    that matched), kind ("organization" or "brand") and score.
+    """
+    if _jsonl():
+        ensure_data_file()
+        return jsonl_store.search_names(DATA_FILE, text, limit=limit)
+    return _name_index().search(text, limit=limit)
+
+def find_similar_organizations(name, threshold=0.5, limit=5):
+    """Existing organizations whose name or brand names look like name; same dicts as search_organizations()."""
+    if _jsonl():
+        ensure_data_file()
+        return jsonl_store.similar_names(DATA_FILE, name, threshold=threshold, limit=limit)
+    return _name_index().similar(name, threshold=threshold, limit=limit)
+
+# Version history
+# Every add/update/delete is logged as a compact delta against the previous
+# version (see utils/version_history.py), so past states can be listed,
+# compared and restored.
+
+def list_versions(record_id):
+    return version_history.list_versions(HISTORY_DIR, record_id)
+
+def get_version(record_id, version):
+    raw = version_history.get_version(HISTORY_DIR, record_id, version)
+    return ClientRecord.from_dict(raw) if raw is not None else None
+
+def diff_versions(record_id, version_a, version_b):
+    return version_history.diff_versions(HISTORY_DIR, record_id, version_a, version_b)
+
+def restore_version(record_id, version, expected_version=None):
+    """
+    Makes a past version the current state of the record. The restore is
+    itself recorded as a new version, so it can be undone as well. Like an
+    edit, it is refused when the stored record is no longer at
+    expected_version (the version the caller read), so a save made in the
+    meantime is not overwritten. Returns the restored record, or None if the
+    version does not exist or the record changed.
+    """
+    with _store_lock():
+        restored = version_history.get_version(HISTORY_DIR, record_id, version)
+        if restored is None:
+            return None
+        current = get_raw(record_id)
+        if current is not None or expected_version is not None:
+            expected = current.get("version", 1) if expected_version is None else expected_version
+            record = ClientRecord.from_dict(restored)
+            updated, _ = _update_records([record], {record_id: expected}, "restore")
+            return record if updated else None
+
+        # The record was deleted: bring it back from its last known state
+        latest = version_history.latest_version(HISTORY_DIR, record_id)
+        last_state = version_history.get_version(HISTORY_DIR, record_id, latest)
+        new_version = latest + 1
+        restored["version"] = new_version
+        if _jsonl():
+            jsonl_store.put(DATA_FILE, restored)
+        else:
+            data = _load_for_update()
+            data.append(restored)
+            save_raw(data)
+        version_history.append_version(HISTORY_DIR, record_id, new_version, restored, old_record=last_state, op="restore")
+        return ClientRecord.from_dict(restored)
+
+# Maintenance
+# Used by the command line (cli.py); all of these stream over the store.
+
+def reindex():
+    """
+    Repairs bookkeeping on every record: assigns missing ids, timestamps and
+    versions, and seeds version history for records that have none.
+    """
+    summary = {"records": 0, "ids_assigned": 0, "history_seeded": 0}
+    seen = set()
+
+    def fixed():
+        for raw in iter_raw():
+            summary["records"] += 1
+            if not raw.get("id") or raw["id"] in seen:
+                raw["id"] = datetime.now().strftime("%Y%m%d%H%M%S%f") + f"{summary['records']:06d}"
+                summary["ids_assigned"] += 1
+            seen.add(raw["id"])
+            raw.setdefault("created_at", datetime.now().isoformat())
+            raw.setdefault("version", 1)
+            if version_history.latest_version(HISTORY_DIR, raw["id"]) is None:
+                version_history.append_version(HISTORY_DIR, raw["id"], raw["version"], raw, op="seed")
+                summary["history_seeded"] += 1
+            yield raw
+
+    with _store_lock():
+        save_raw_stream(fixed())
+    return summary
+
+def compact(keep_versions=None):
+    """
+    Rewrites the store and every history log. Logs are re-based so the
+    checkpoint spacing is restored; with keep_versions only the most recent
+    versions of each record are kept.
+    """
+    # History logs are rewritten too, so saves wait for the whole run
+    with _store_lock():
+        before = os.path.getsize(DATA_FILE)
+        records = save_raw_stream(iter_raw())
+        summary = {"records": records, "store_bytes_before": before, "store_bytes_after": os.path.getsize(DATA_FILE),
+                   "history_bytes_before": 0, "history_bytes_after": 0}
+        if os.path.isdir(HISTORY_DIR):
+            for name in os.listdir(HISTORY_DIR):
+                if name.endswith(".jsonl"):
+                    old_size, new_size = version_history.compact(HISTORY_DIR, name[:-len(".jsonl")], keep=keep_versions)
+                    summary["history_bytes_before"] += old_size
+                    summary["history_bytes_after"] += new_size
+    return summary
+
+def rebuild_index():
+    """
+    Rebuilds the offset index of a jsonl store from the records themselves.
+    Returns the number of live records, or None for the json format.
+    """
+    if not _jsonl():
+        return None
+    with _store_lock():
+        return jsonl_store.rebuild_index(DATA_FILE)
+
+def convert_storage(storage_format):
+    """
+    Copies the store of the current data directory into another storage
+    format and switches to it. The old file is left in place. Returns the
+    number of records copied.
+    """
+    if storage_format == STORAGE_FORMAT:
+        return 0
+    old_file, old_format = DATA_FILE, STORAGE_FORMAT
+
+    def records():
+        if old_format == "jsonl":
+            yield from jsonl_store.iter_raw(old_file)
+        else:
+            with open(old_file, "r") as f:
+                yield from iter_json_array(f)
+
+    # Saves to the old store wait until the copy is complete
+    with _store_lock():
+        configure(storage_format=storage_format)
+        return save_raw_stream(records())
+
+def validate():
+    """Yields (record, problem) pairs for every inconsistency in the store."""
+    ids = set()
+    try:
+        for i, raw in enumerate(iter_raw()):
+            label = raw.get("organization", f"#{i}") if isinstance(raw, dict) else f"#{i}"
+            try:
+                record = ClientRecord.from_dict(raw)
+            except ValueError as e:
+                yield label, str(e)
+                continue
+            if not record.id:
+                yield label, "missing id"
+                continue
+            if record.id in ids:
+                yield label, f"duplicate id {record.id}"
+            ids.add(record.id)
+            latest = version_history.latest_version(HISTORY_DIR, record.id)
+            if latest is not None and latest != (record.version or 1):
+                yield label, f"version {record.version} does not match history (latest {latest})"
+    except json.JSONDecodeError as e:
+        yield DATA_FILE, f"unreadable store: {e}"
+
@@ -0,0 +1,169 @@
+import io
+from utils.models import ClientRecord, PLATFORM_ACCESS_KEYS
+
+def flatten_record(record):
+    """
+    Flattens a client record into the rows of the "Detailed Data" sheet:
+    one row per Category / Sub-Category / Detail entry.
+    """
+    if isinstance(record, dict):
+        record = ClientRecord.from_dict(record)
+    flat_data = []
+    
+    org = record.organization
+    exec_name = record.executive_name
+    rec_type = record.type
+    date = record.date
+    reports_list = ", ".join(record.reports)
+
+    for b in record.brands:
+        brand_name = b.name
+        b_data = b.data
+        
+        # Base row data
+        base_row = {
+            "Record ID": record.id,
+            "Executive Name": exec_name,
+            "Organization": org,
+            "Type": rec_type,
+            "Date": date,
+            "Brand": brand_name,
+            "Reports Selected": reports_list
+        }
+        
+        # 1. Competitor Analysis
+        comp_analysis = b_data.competitor_analysis
+        if comp_analysis:
+            # Brand Socials
+            for platform, link in comp_analysis.brand_socials.items():
+                row = base_row.copy()
+                row["Category"] = "Brand Socials"
+                row["Sub-Category"] = platform.capitalize()
+                row["Detail"] = link
+                flat_data.append(row)
+                
+            # Competitors
+            for i, comp in enumerate(comp_analysis.competitors):
+                c_name = comp.name or f"Competitor {i+1}"
+                for platform, link in comp.socials.items():
+                    row = base_row.copy()
+                    row["Category"] = "Competitor Analysis"
+                    row["Sub-Category"] = f"{c_name} - {platform.capitalize()}"
+                    row["Detail"] = link
+                    flat_data.append(row)
+
+        # 2. Google Trends
+        g_trends = b_data.google_trends
+        if g_trends:
+            row = base_row.copy()
+            row["Category"] = "Google Trends"
+            row["Sub-Category"] = "Link"
+            row["Detail"] = g_trends.link
+            flat_data.append(row)
+            
+            row = base_row.copy()
+            row["Category"] = "Google Trends"
+            row["Sub-Category"] = "Search Terms"
+            row["Detail"] = g_trends.search_terms
+            flat_data.append(row)
+
+        # 3. Web Traffic
+        web_traffic = b_data.web_traffic
+        if web_traffic:
+            row = base_row.copy()
+            row["Category"] = "Web Traffic"
+            row["Sub-Category"] = "Selected Competitors"
+            row["Detail"] = ", ".join(web_traffic.selected_competitors)
+            flat_data.append(row)
+
+        # 4. Social Listening
+        social_listening = b_data.social_listening
+        if social_listening and social_listening.enabled and social_listening.brand_health:
+            brand_health = social_listening.brand_health
+            
+            # Keywords
+            if brand_health.keywords:
+                row = base_row.copy()
+                row["Category"] = "Social Listening"
+                row["Sub-Category"] = "Keywords"
+                row["Detail"] = ", ".join(brand_health.keywords)
+                flat_data.append(row)
+                
+            # Hashtags
+            if brand_health.hashtags:
+                row = base_row.copy()
+                row["Category"] = "Social Listening"
+                row["Sub-Category"] = "Hashtags"
+                row["Detail"] = ", ".join(brand_health.hashtags)
+                flat_data.append(row)
+
+        # 5. Platform Access (Meta, GA, etc.)
+        for pk in PLATFORM_ACCESS_KEYS:
+            p_data = getattr(b_data, pk)
+            if p_data:
+                row = base_row.copy()
+                row["Category"] = "Platform Access"
+                row["Sub-Category"] = pk.replace("_", " ").title()
+                row["Detail"] = p_data
+                flat_data.append(row)
+
+    if not flat_data:
+        # If no detailed data, at least return the base info
+        flat_data.append({
+            "Record ID": record.id,
+            "Executive Name": exec_name,
+            "Organization": org,
+            "Type": rec_type,
+            "Date": date,
+            "Brand": "",
+            "Reports Selected": reports_list,
+            "Category": "No Data",
+            "Sub-Category": "",
+            "Detail": ""
+        })
+
+    return flat_data
+
+COLUMNS = ["Executive Name", "Organization", "Type", "Date", "Brand", "Reports Selected",
+           "Category", "Sub-Category", "Detail", "Record ID"]
+# Written so an edited workbook can be imported back onto the right record
+# (see utils/excel_import.py); hidden since it means nothing to a reader
+HIDDEN_COLUMNS = {"Record ID"}
+
+def write_excel(records, output):
+    """
+    Writes the "Detailed Data" sheet for any number of records to output (a
+    path or file object). The workbook is written in openpyxl's write-only
+    mode, so rows are streamed out instead of held in memory.
+    """
+    # openpyxl is only imported when a workbook is actually requested
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Detailed Data")
+    header_font = Font(bold=True)
+    for i, col in enumerate(COLUMNS, start=1):
+        if col in HIDDEN_COLUMNS:
+            ws.column_dimensions[get_column_letter(i)].hidden = True
+
+    header = []
+    for col in COLUMNS:
+        cell = WriteOnlyCell(ws, value=col)
+        cell.font = header_font
+        header.append(cell)
+    ws.append(header)
+
+    for record in records:
+        for row in flatten_record(record):
+            ws.append([row.get(col) for col in COLUMNS])
+
+    wb.save(output)
+
+def generate_excel(record):
+    buffer = io.BytesIO()
+    write_excel([record], buffer)
+    buffer.seek(0)
+    return buffer
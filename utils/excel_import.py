@@ -0,0 +1,311 @@
+import copy
+from datetime import date, datetime
+
+from utils import data_manager, version_history
+from utils.excel_export import COLUMNS
+from utils.models import PLATFORMS, PLATFORM_ACCESS_KEYS, ClientRecord
+
+# Reads a "Detailed Data" workbook produced by excel_export (possibly edited
+# offline) and turns it back into record changes. Rows are mapped through
+# Category / Sub-Category / Detail, the inverse of flatten_record():
+#
+#   Brand Socials        <Platform>               competitor_analysis.brand_socials
+#   Competitor Analysis  <Competitor> - <Platform> competitor_analysis.competitors[].socials
+#   Google Trends        Link / Search Terms      google_trends.link / search_terms
+#   Web Traffic          Selected Competitors     web_traffic.selected_competitors
+#   Social Listening     Keywords / Hashtags      social_listening.brand_health
+#   Platform Access      <Key Title>              meta_platform, google_analytics, ...
+#
+# plus the record-level Executive Name, Date and Reports Selected columns.
+# Records are matched on the hidden Record ID column, and brands on Brand.
+# Workbooks exported before that column existed are matched on Organization
+# and Type instead, as long as that names a single record. Rows missing from
+# the sheet leave their fields untouched; a cleared Detail cell clears the
+# field (an empty cell over a field that was never set changes nothing).
+#
+# The workbook is streamed in openpyxl's read-only mode. Rows are handled one
+# organization at a time (rows come grouped as written by write_excel), so
+# only the records that actually change are kept in memory.
+
+REQUIRED_COLUMNS = ("Organization", "Brand", "Category", "Sub-Category", "Detail")
+
+
+def _text(value):
+    """Cell value as stored text: empty cells are "", dates become ISO strings."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _split_list(value):
+    return [item.strip() for item in _text(value).split(",") if item.strip()]
+
+
+def _set_text(target, key, value):
+    # flatten_record writes unset (None) fields as empty cells; leaving such a
+    # cell empty must not turn None into ""
+    value = _text(value)
+    if value or target.get(key) is not None:
+        target[key] = value
+
+
+def iter_rows(source, sheet="Detailed Data"):
+    """
+    Streams the rows of the sheet as (row_number, {column: value}) pairs.
+    source is a path or a binary file object.
+    """
+    # openpyxl is only imported when a workbook is actually read
+    from zipfile import BadZipFile
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        wb = load_workbook(source, read_only=True, data_only=True)
+    except (BadZipFile, InvalidFileException) as e:
+        raise ValueError(f"Not an Excel workbook: {e}") from e
+    try:
+        ws = wb[sheet] if sheet in wb.sheetnames else wb.active
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("The workbook is empty")
+        header = [_text(h) for h in header]
+        missing = [c for c in REQUIRED_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"Not a Detailed Data sheet; missing columns: {', '.join(missing)}")
+        positions = {c: header.index(c) for c in COLUMNS if c in header}
+        for number, values in enumerate(rows, start=2):
+            if values is None or all(v is None for v in values):
+                continue
+            yield number, {c: values[i] if i < len(values) else None for c, i in positions.items()}
+    finally:
+        wb.close()
+
+
+# --- Mapping rows onto a record --------------------------------------------------
+
+def _platform_key(socials, label):
+    # flatten_record writes platform.capitalize(); map it back to the stored key
+    for key in socials:
+        if key.capitalize() == label:
+            return key
+    return label.lower()
+
+
+def _brand_data(raw, brand_name):
+    for brand in raw.get("brands", []):
+        if brand.get("name") == brand_name:
+            return brand.setdefault("data", {})
+    return None
+
+
+def _competitor_analysis(data):
+    return data.setdefault("competitor_analysis", {"brand_socials": {}, "competitors": []})
+
+
+def _apply_detail(data, category, sub, detail):
+    """Sets the field a row points at. Returns an error message or None."""
+    if category == "Brand Socials":
+        socials = _competitor_analysis(data).setdefault("brand_socials", {})
+        _set_text(socials, _platform_key(socials, sub), detail)
+
+    elif category == "Competitor Analysis":
+        if " - " not in sub:
+            return f"Sub-Category {sub!r} is not '<Competitor> - <Platform>'"
+        name, platform = sub.rsplit(" - ", 1)
+        competitors = _competitor_analysis(data).setdefault("competitors", [])
+        competitor = None
+        for i, c in enumerate(competitors):
+            if (c.get("name") or f"Competitor {i + 1}") == name:
+                competitor = c
+                break
+        if competitor is None:
+            competitor = {"name": name, "socials": {p: "" for p in PLATFORMS}}
+            competitors.append(competitor)
+        socials = competitor.setdefault("socials", {})
+        _set_text(socials, _platform_key(socials, platform), detail)
+
+    elif category == "Google Trends":
+        field = {"Link": "link", "Search Terms": "search_terms"}.get(sub)
+        if field is None:
+            return f"Unknown Google Trends field {sub!r}"
+        _set_text(data.setdefault("google_trends", {"link": "", "search_terms": ""}), field, detail)
+
+    elif category == "Web Traffic":
+        if sub != "Selected Competitors":
+            return f"Unknown Web Traffic field {sub!r}"
+        data.setdefault("web_traffic", {})["selected_competitors"] = _split_list(detail)
+
+    elif category == "Social Listening":
+        field = {"Keywords": "keywords", "Hashtags": "hashtags"}.get(sub)
+        if field is None:
+            return f"Unknown Social Listening field {sub!r}"
+        sl = data.setdefault("social_listening", {"enabled": True})
+        sl["enabled"] = True
+        sl.setdefault("brand_health", {"keywords": [], "hashtags": []})[field] = _split_list(detail)
+
+    elif category == "Platform Access":
+        key = next((pk for pk in PLATFORM_ACCESS_KEYS if pk.replace("_", " ").title() == sub), None)
+        if key is None:
+            return f"Unknown platform {sub!r}"
+        _set_text(data, key, detail)
+
+    elif category != "No Data":
+        return f"Unknown category {category!r}"
+    return None
+
+
+def _apply_record_fields(raw, base, row):
+    # These columns repeat on every row of a record; a row only counts as an
+    # edit where its value differs from the stored one, so one edited row is
+    # not undone by the unedited rows around it
+    date_field = "presentation_date" if raw.get("type") == "pitch" else "onboard_date"
+    for column, field, parse in [("Executive Name", "executive_name", _text),
+                                 ("Reports Selected", "reports", _split_list),
+                                 ("Date", date_field, _text)]:
+        if row.get(column) is None:
+            continue
+        value = parse(row[column])
+        stored = base.get(field)
+        if value != (stored if stored is not None else parse(None)):
+            raw[field] = value
+
+
+def _apply_rows(raw, base, rows, issues):
+    for number, row in rows:
+        if row.get("Type") is not None and _text(row["Type"]) != (raw.get("type") or ""):
+            issues.append((number, "Type cannot be changed from the workbook; ignored"))
+        if _text(row.get("Organization")) != (raw.get("organization") or ""):
+            issues.append((number, "Organization cannot be changed from the workbook; ignored"))
+        _apply_record_fields(raw, base, row)
+        category = _text(row.get("Category"))
+        if category == "No Data":
+            continue
+        data = _brand_data(raw, _text(row.get("Brand")))
+        if data is None:
+            issues.append((number, f"Unknown brand {_text(row.get('Brand'))!r}; row skipped"))
+            continue
+        error = _apply_detail(data, category, _text(row.get("Sub-Category")), row.get("Detail"))
+        if error:
+            issues.append((number, f"{error}; row skipped"))
+
+
+def _normalized(raw):
+    # Round-trip through the model so both sides of the diff share one layout
+    return ClientRecord.from_dict(raw).to_dict()
+
+
+# --- Plan / apply -------------------------------------------------------------------
+
+def _row_key(row):
+    """What a row's record is matched on: its id, or (organization, type) for older workbooks."""
+    record_id = _text(row.get("Record ID"))
+    if record_id:
+        return ("id", record_id)
+    return ("org", _text(row.get("Organization")), _text(row.get("Type")))
+
+
+def _find_record(key):
+    """The stored record a row key points at, or (None, reason the rows were skipped)."""
+    if key[0] == "id":
+        stored = data_manager.get_record(key[1])
+        if stored is None:
+            return None, f"Unknown record id {key[1]!r}; its rows were skipped"
+        return stored, None
+    _, org, rec_type = key
+    candidates = data_manager.get_records_by_org(org)
+    if not candidates:
+        return None, f"Unknown organization {org!r}; its rows were skipped"
+    if rec_type:
+        candidates = [r for r in candidates if r.type == rec_type]
+    if not candidates:
+        return None, f"Organization {org!r} has no {rec_type} record; its rows were skipped"
+    if len(candidates) > 1:
+        kind = f"{rec_type} records" if rec_type else "records"
+        return None, (f"Organization {org!r} has {len(candidates)} {kind} and the "
+                      "workbook has no Record ID column to tell them apart; re-export it. Its rows were skipped")
+    return candidates[0], None
+
+
+def plan_import(source):
+    """
+    Reads an edited workbook and computes the minimal change per record
+    without writing anything. Returns a dict:
+        changes  [{id, organization, type, version, record, diff}] for changed records
+        issues   [(row number, message)] for rows that could not be applied
+        rows     number of data rows read
+    """
+    pending = {}   # record id -> {"id", "version", "base", "record"}
+    issues = []
+    rows_read = 0
+    skipped = set()   # row keys that matched no single record
+    matched = {}      # row key -> record id
+
+    def flush(key, rows):
+        if key in skipped:
+            return
+        entry = pending.get(matched.get(key))
+        if entry is None:
+            stored, problem = _find_record(key)
+            if stored is None:
+                skipped.add(key)
+                issues.append((rows[0][0], problem))
+                return
+            matched[key] = stored.id
+            entry = pending.get(stored.id)
+            if entry is None:
+                base = stored.to_dict()
+                entry = {"id": stored.id, "version": stored.version or 1, "base": base, "record": copy.deepcopy(base)}
+        _apply_rows(entry["record"], entry["base"], rows, issues)
+        # Only records that end up changed stay in memory
+        if version_history.diff(entry["base"], _normalized(entry["record"])):
+            pending[entry["id"]] = entry
+        else:
+            pending.pop(entry["id"], None)
+
+    group_key, group = None, []
+    for number, row in iter_rows(source):
+        rows_read += 1
+        if not _text(row.get("Organization")) and not _text(row.get("Record ID")):
+            issues.append((number, "Missing Organization; row skipped"))
+            continue
+        key = _row_key(row)
+        if key != group_key and group:
+            flush(group_key, group)
+            group = []
+        group_key = key
+        group.append((number, row))
+    if group:
+        flush(group_key, group)
+
+    changes = []
+    for entry in pending.values():
+        new = _normalized(entry["record"])
+        changes.append({
+            "id": entry["id"],
+            "organization": entry["base"].get("organization"),
+            "type": entry["base"].get("type"),
+            "version": entry["version"],
+            "record": new,
+            "diff": version_history.describe(entry["base"], new),
+        })
+    return {"changes": changes, "issues": issues, "rows": rows_read}
+
+
+def apply_import(plan):
+    """
+    Writes every change of a plan in one batched update. Records saved by
+    someone else since the plan was made are not overwritten; they are
+    returned as conflicts. Returns (updated ids, conflicting ids).
+    """
+    if not plan["changes"]:
+        return [], []
+    records = [c["record"] for c in plan["changes"]]
+    expected = {c["id"]: c["version"] for c in plan["changes"]}
+    return data_manager.update_client_records(records, expected_versions=expected)
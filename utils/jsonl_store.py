@@ -0,0 +1,398 @@
+import json
+import mmap
+import os
+import tempfile
+import threading
+
+from utils import name_index, query_index
+
+# Records are stored one per line (JSON Lines) in an append-only log. Writes
+# never rewrite the file: an update appends the new state of the record and a
+# delete appends a tombstone line {"_deleted": "<id>"}, so the last line for
+# an id wins. A sidecar index (<name>.idx.json) maps every live id to the byte
+# offset and length of its current line plus its organization, query fields
+# (utils/query_index.py) and brand names (utils/name_index.py), so reads
+# memory-map the log and parse only the lines they need. compact/rewrite drop superseded lines.
+#
+# The index records the inode and size of the log it describes. Lines
+# appended since (by this or another process) are picked up by scanning only
+# the tail; a log that was replaced or truncated is re-indexed from scratch.
+# A save therefore does not rewrite the sidecar: it is only written again
+# once the tail it does not cover outgrows INDEX_SAVE_RATIO of the log (and
+# INDEX_SAVE_MIN_BYTES), which keeps saves O(1) amortized and the tail a
+# fresh process has to scan short.
+#
+# Streamlit runs sessions as threads of one process, which share the cached
+# Index objects. scan() updates them in place, so every read of an index
+# (entries, the lazily built lookups) happens under _lock; readers copy out
+# what they need and read the log itself outside of it.
+
+INDEX_FORMAT = 3
+TOMBSTONE = "_deleted"
+INDEX_SAVE_RATIO = 0.125
+INDEX_SAVE_MIN_BYTES = 1 << 20
+
+
+def index_path(data_file):
+    return os.path.splitext(data_file)[0] + ".idx.json"
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _entry(raw, offset, length):
+    return [offset, length, raw.get("organization"), query_index.fields(raw),
+            [b.get("name") for b in raw.get("brands") or []]]
+
+
+class Index:
+    """id -> [offset, length, organization, query fields, brand names] for the live records, in log order."""
+
+    def __init__(self, inode, size=0, entries=None):
+        self.inode = inode
+        self.size = size
+        self.entries = entries if entries is not None else {}
+        self.saved_size = size  # log bytes covered by the sidecar on disk
+        self._by_org = None
+        self._organizations = None
+        self._query = None
+        self._names = None
+
+    def by_org(self):
+        if self._by_org is None:
+            by_org = {}
+            for record_id, entry in self.entries.items():
+                by_org.setdefault(entry[2], []).append(record_id)
+            self._by_org = by_org
+        return self._by_org
+
+    def organizations(self):
+        """Sorted organization names, cached until the log changes."""
+        if self._organizations is None:
+            self._organizations = sorted((org for org in self.by_org() if org is not None), key=str.casefold)
+        return self._organizations
+
+    def query_index(self):
+        """Secondary indexes, built on first use and then kept up to date by scan()."""
+        if self._query is None:
+            index = query_index.QueryIndex()
+            for record_id, entry in self.entries.items():
+                index.add(record_id, entry[3])
+            self._query = index
+        return self._query
+
+    def name_index(self):
+        """Organization and brand name index, built on first use and then kept up to date by scan()."""
+        if self._names is None:
+            index = name_index.NameIndex()
+            for record_id, entry in self.entries.items():
+                index.add(record_id, entry[2], entry[4])
+            self._names = index
+        return self._names
+
+    def scan(self, mm, start):
+        """Indexes the complete lines of mm from byte offset start on."""
+        pos = start
+        end = len(mm)
+        while pos < end:
+            nl = mm.find(b"\n", pos)
+            if nl < 0:
+                # A line still being written; pick it up next time
+                break
+            if nl > pos:
+                raw = json.loads(mm[pos:nl])
+                if TOMBSTONE in raw:
+                    self.entries.pop(raw[TOMBSTONE], None)
+                    if self._query is not None:
+                        self._query.remove(raw[TOMBSTONE])
+                    if self._names is not None:
+                        self._names.remove(raw[TOMBSTONE])
+                else:
+                    record_id = raw.get("id") or f"@{pos}"
+                    entry = self.entries[record_id] = _entry(raw, pos, nl - pos)
+                    if self._query is not None:
+                        self._query.add(record_id, entry[3])
+                    if self._names is not None:
+                        self._names.add(record_id, entry[2], entry[4])
+            pos = nl + 1
+        if pos != self.size:
+            self._by_org = None
+            self._organizations = None
+        self.size = pos
+
+    def to_json(self):
+        return {
+            "format": INDEX_FORMAT,
+            "inode": self.inode,
+            "size": self.size,
+            "entries": [[record_id] + entry for record_id, entry in self.entries.items()],
+        }
+
+    @classmethod
+    def from_json(cls, obj):
+        entries = {e[0]: e[1:] for e in obj["entries"]}
+        return cls(obj["inode"], obj["size"], entries)
+
+
+# Last index seen per log file, so a Streamlit rerun does not re-read the sidecar
+_cache = {}
+_lock = threading.RLock()
+
+
+def _map(data_file):
+    # mmap cannot map an empty file
+    with open(data_file, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _close(mm):
+    if isinstance(mm, mmap.mmap):
+        mm.close()
+
+
+def _temp_file(path):
+    # Unique per call: threads share a pid, so a pid-based name would collide
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.chmod(tmp_path, 0o644)
+    return fd, tmp_path
+
+
+def _save_index(data_file, index):
+    path = index_path(data_file)
+    fd, tmp_path = _temp_file(path)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(_dumps(index.to_json()))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    index.saved_size = index.size
+
+
+def _read_index(data_file):
+    try:
+        with open(index_path(data_file), "r") as f:
+            obj = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if obj.get("format") != INDEX_FORMAT:
+        return None
+    return Index.from_json(obj)
+
+
+def load_index(data_file):
+    """
+    Returns the index of data_file, bringing it up to date with the log.
+    The index is shared between threads: read it while holding _lock.
+    """
+    with _lock:
+        return _load_index(data_file)
+
+
+def _load_index(data_file):
+    st = os.stat(data_file)
+    index = _cache.get(data_file)
+    if index is not None and index.inode == st.st_ino and index.size == st.st_size:
+        return index
+
+    if index is None or index.inode != st.st_ino or index.size > st.st_size:
+        index = _read_index(data_file)
+    if index is None or index.inode != st.st_ino or index.size > st.st_size:
+        index = Index(st.st_ino)
+
+    size = index.size
+    if size < st.st_size:
+        mm = _map(data_file)
+        try:
+            index.scan(mm, size)
+        finally:
+            _close(mm)
+    unsaved = index.size - index.saved_size
+    if unsaved > max(INDEX_SAVE_MIN_BYTES, index.size * INDEX_SAVE_RATIO) or not os.path.exists(index_path(data_file)):
+        _save_index(data_file, index)
+    _cache[data_file] = index
+    return index
+
+
+def rebuild_index(data_file):
+    """Re-indexes the whole log, ignoring the sidecar. Returns the live record count."""
+    st = os.stat(data_file)
+    index = Index(st.st_ino)
+    mm = _map(data_file)
+    try:
+        index.scan(mm, 0)
+    finally:
+        _close(mm)
+    with _lock:
+        _save_index(data_file, index)
+        _cache[data_file] = index
+    return len(index.entries)
+
+
+# --- Reads --------------------------------------------------------------------
+
+def _read(mm, entry):
+    offset, length = entry[0], entry[1]
+    return json.loads(mm[offset:offset + length])
+
+
+def get(data_file, record_id):
+    with _lock:
+        entry = load_index(data_file).entries.get(record_id)
+    if entry is None:
+        return None
+    mm = _map(data_file)
+    try:
+        return _read(mm, entry)
+    finally:
+        _close(mm)
+
+
+def iter_by_org(data_file, org):
+    with _lock:
+        index = load_index(data_file)
+        entries = [index.entries[record_id] for record_id in index.by_org().get(org, [])]
+    if not entries:
+        return
+    mm = _map(data_file)
+    try:
+        for entry in entries:
+            yield _read(mm, entry)
+    finally:
+        _close(mm)
+
+
+def get_by_org(data_file, org):
+    return next(iter_by_org(data_file, org), None)
+
+
+def organizations(data_file):
+    """Sorted organization names from the index alone, without reading any record."""
+    with _lock:
+        return list(load_index(data_file).organizations())
+
+
+def count(data_file):
+    with _lock:
+        return len(load_index(data_file).entries)
+
+
+def query_ids(data_file, **filters):
+    """Ids of the live records matching the filters, from the index alone."""
+    with _lock:
+        return load_index(data_file).query_index().query(**filters)
+
+
+def query(data_file, **filters):
+    """Streams the live records matching the filters (see QueryIndex.query), reading only those."""
+    with _lock:
+        index = load_index(data_file)
+        entries = [index.entries[record_id] for record_id in index.query_index().query(**filters)]
+    if not entries:
+        return
+    mm = _map(data_file)
+    try:
+        for entry in entries:
+            yield _read(mm, entry)
+    finally:
+        _close(mm)
+
+
+def facets(data_file):
+    with _lock:
+        return load_index(data_file).query_index().facets()
+
+
+def search_names(data_file, text, limit=20):
+    """NameIndex.search over the organization and brand names of the live records."""
+    with _lock:
+        return load_index(data_file).name_index().search(text, limit=limit)
+
+
+def similar_names(data_file, name, threshold=0.5, limit=5):
+    """NameIndex.similar over the organization and brand names of the live records."""
+    with _lock:
+        return load_index(data_file).name_index().similar(name, threshold=threshold, limit=limit)
+
+
+def iter_raw(data_file):
+    """Streams the live records in log order."""
+    with _lock:
+        entries = list(load_index(data_file).entries.values())
+    if not entries:
+        return
+    mm = _map(data_file)
+    try:
+        for entry in entries:
+            yield _read(mm, entry)
+    finally:
+        _close(mm)
+
+
+# --- Writes -------------------------------------------------------------------
+
+def _append_lines(data_file, objs):
+    data = "".join(_dumps(obj) + "\n" for obj in objs).encode("utf-8")
+    # A single O_APPEND write, so concurrent writers never interleave lines
+    fd = os.open(data_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    load_index(data_file)
+
+
+def _append_line(data_file, obj):
+    _append_lines(data_file, [obj])
+
+
+def put(data_file, record):
+    """Appends the current state of a record (new or updated)."""
+    _append_line(data_file, record)
+
+
+def put_many(data_file, records):
+    """Appends several records in one write."""
+    _append_lines(data_file, records)
+
+
+def delete(data_file, record_id):
+    _append_line(data_file, {TOMBSTONE: record_id})
+
+
+def delete_many(data_file, record_ids):
+    """Appends the tombstones of several records in one write."""
+    _append_lines(data_file, [{TOMBSTONE: record_id} for record_id in record_ids])
+
+
+def rewrite(data_file, records):
+    """
+    Replaces the log with the given records, one line each, and re-indexes it.
+    The file is swapped in atomically, so records may be streamed from
+    iter_raw() of the same file. Returns the number of records written.
+    """
+    fd, tmp_path = _temp_file(data_file)
+    entries = {}
+    offset = written = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for record in records:
+                line = _dumps(record).encode("utf-8")
+                f.write(line + b"\n")
+                record_id = record.get("id") or f"@{offset}"
+                entries[record_id] = _entry(record, offset, len(line))
+                offset += len(line) + 1
+                written += 1
+        os.replace(tmp_path, data_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    index = Index(os.stat(data_file).st_ino, offset, entries)
+    with _lock:
+        _save_index(data_file, index)
+        _cache[data_file] = index
+    return written
@@ -0,0 +1,492 @@
+import math
+import sys
+from collections.abc import MutableSequence
+from dataclasses import dataclass, field
+
+# Typed client records.
+#
+# Records are stored as nested JSON (see data/clients.json). These slotted
+# dataclasses mirror that structure one class per level; from_dict() validates
+# and decodes the stored form and to_dict() encodes back to its canonical
+# layout. Absent optional fields come back with their defaults (e.g.
+# executive_name "", type "onboard", reports [], search_terms ""), so
+# to_dict(from_dict(d)) == d holds for records written by to_dict() (every
+# record the app saves), not for hand-written ones; to_dict() is idempotent
+# either way. Unknown top-level keys and absent social platforms are kept as
+# they are.
+#
+# Decoding costs about three times as much as parsing the JSON, so
+# LazyRecords decodes a whole portfolio only as far as it is used.
+#
+# Strings that repeat across the whole portfolio (report names, record types,
+# executive names) are interned so every record shares a single copy of each.
+# Platform names are not stored per record at all: they are slot names.
+
+PLATFORMS = ["facebook", "instagram", "twitter", "tiktok", "linkedin", "youtube", "website"]
+PLATFORM_ACCESS_KEYS = ["meta_platform", "google_analytics", "meta_campaigns", "google_ads"]
+
+_intern = sys.intern
+_PLATFORM_SET = frozenset(PLATFORMS)
+_MISSING = object()
+
+
+class RecordValidationError(ValueError):
+    """Raised when a stored record does not have the expected shape."""
+
+    def __init__(self, message, path=None):
+        super().__init__(message)
+        self.message = message
+        self.path = path or []
+
+    def prefixed(self, part):
+        self.path.insert(0, part)
+        return self
+
+    def __str__(self):
+        return f"{'.'.join(self.path)}: {self.message}" if self.path else self.message
+
+
+# Validation helpers. The field path is only assembled when something fails,
+# so decoding valid records does no string formatting at all.
+
+def _error(key, expected, value):
+    return RecordValidationError(f"expected {expected}, got {type(value).__name__}", [key])
+
+
+def _is_nan(value):
+    # Values edited through st.data_editor come back as NaN for empty cells
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _str(value, key):
+    if value.__class__ is str:
+        return value
+    raise _error(key, "string", value)
+
+
+def _opt_str(value, key):
+    if value is None or value.__class__ is str:
+        return value
+    if _is_nan(value):
+        return None
+    raise _error(key, "string or null", value)
+
+
+def _str_list(value, key, intern=False):
+    if value is None:
+        return []
+    if value.__class__ is not list:
+        raise _error(key, "list", value)
+    if all(item.__class__ is str for item in value):
+        return [_intern(item) for item in value] if intern else list(value)
+    out = []
+    for i, item in enumerate(value):
+        if item is None or _is_nan(item):
+            continue
+        if item.__class__ is not str:
+            raise _error(f"{key}[{i}]", "string", item)
+        out.append(_intern(item) if intern else item)
+    return out
+
+
+def _dict(value, key):
+    if value is None:
+        return {}
+    if value.__class__ is dict:
+        return value
+    raise _error(key, "object", value)
+
+
+def _decode(cls, value, key):
+    if value is None:
+        return None
+    try:
+        return cls.from_dict(value)
+    except RecordValidationError as e:
+        raise e.prefixed(key)
+
+
+def _decode_list(cls, value, key):
+    if value is None:
+        return []
+    if value.__class__ is not list:
+        raise _error(key, "list", value)
+    try:
+        return [cls.from_dict(item) for item in value]
+    except RecordValidationError as e:
+        # Slow path: find which item failed so the error names it
+        for i, item in enumerate(value):
+            try:
+                cls.from_dict(item)
+            except RecordValidationError:
+                raise e.prefixed(f"{key}[{i}]")
+        raise
+
+
+class Socials:
+    """
+    Social media links keyed by platform. Behaves like the {platform: link}
+    dict it is stored as, but keeps the standard platforms in slots instead of
+    a per-record hash table. Unknown platforms go to an overflow dict.
+    """
+    __slots__ = PLATFORMS + ["_extra"]
+
+    def __init__(self, links=None):
+        self._extra = None
+        for platform in PLATFORMS:
+            setattr(self, platform, _MISSING)
+        if links:
+            for platform, link in links.items():
+                self[platform] = link
+
+    @classmethod
+    def from_dict(cls, d):
+        d = _dict(d, "socials")
+        self = object.__new__(cls)
+        self._extra = None
+        found = 0
+        for platform in PLATFORMS:
+            value = d.get(platform, _MISSING)
+            if value is not _MISSING:
+                found += 1
+                if value is not None and value.__class__ is not str:
+                    value = _opt_str(value, platform)
+            setattr(self, platform, value)
+        if found != len(d):
+            for key, value in d.items():
+                if key not in _PLATFORM_SET:
+                    self[_str(key, "socials")] = _opt_str(value, key)
+        return self
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __setitem__(self, platform, link):
+        if platform in _PLATFORM_SET:
+            setattr(self, platform, link)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[_intern(platform)] = link
+
+    def __getitem__(self, platform):
+        value = self.get(platform, _MISSING)
+        if value is _MISSING:
+            raise KeyError(platform)
+        return value
+
+    def get(self, platform, default=None):
+        if platform in _PLATFORM_SET:
+            value = getattr(self, platform)
+            return default if value is _MISSING else value
+        if self._extra:
+            return self._extra.get(platform, default)
+        return default
+
+    def items(self):
+        for platform in PLATFORMS:
+            value = getattr(self, platform)
+            if value is not _MISSING:
+                yield platform, value
+        if self._extra:
+            yield from self._extra.items()
+
+    def keys(self):
+        return [k for k, _ in self.items()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, Socials):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return f"Socials({self.to_dict()!r})"
+
+
+@dataclass(slots=True)
+class Competitor:
+    name: str
+    socials: Socials = field(default_factory=Socials)
+
+    @classmethod
+    def from_dict(cls, d):
+        d = _dict(d, "competitor")
+        return cls(_str(d.get("name"), "name"), _decode(Socials, d.get("socials", {}), "socials"))
+
+    def to_dict(self):
+        return {"name": self.name, "socials": self.socials.to_dict()}
+
+
+@dataclass(slots=True)
+class CompetitorAnalysis:
+    brand_socials: Socials = field(default_factory=Socials)
+    competitors: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d):
+        d = _dict(d, "competitor_analysis")
+        return cls(
+            _decode(Socials, d.get("brand_socials", {}), "brand_socials"),
+            _decode_list(Competitor, d.get("competitors"), "competitors"),
+        )
+
+    def to_dict(self):
+        return {
+            "brand_socials": self.brand_socials.to_dict(),
+            "competitors": [c.to_dict() for c in self.competitors],
+        }
+
+
+@dataclass(slots=True)
+class GoogleTrends:
+    link: str = ""
+    search_terms: str = ""
+
+    @classmethod
+    def from_dict(cls, d):
+        d = _dict(d, "google_trends")
+        return cls(_opt_str(d.get("link", ""), "link"), _opt_str(d.get("search_terms", ""), "search_terms"))
+
+    def to_dict(self):
+        return {"link": self.link, "search_terms": self.search_terms}
+
+
+@dataclass(slots=True)
+class WebTraffic:
+    selected_competitors: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d):
+        d = _dict(d, "web_traffic")
+        return cls(_str_list(d.get("selected_competitors"), "selected_competitors"))
+
+    def to_dict(self):
+        return {"selected_competitors": list(self.selected_competitors)}
+
+
+@dataclass(slots=True)
+class BrandHealth:
+    keywords: list = field(default_factory=list)
+    hashtags: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d):
+        d = _dict(d, "brand_health")
+        return cls(_str_list(d.get("keywords"), "keywords"), _str_list(d.get("hashtags"), "hashtags"))
+
+    def to_dict(self):
+        return {"keywords": list(self.keywords), "hashtags": list(self.hashtags)}
+
+
+@dataclass(slots=True)
+class SocialListening:
+    enabled: bool = False
+    brand_health: BrandHealth = None
+
+    @classmethod
+    def from_dict(cls, d):
+        d = _dict(d, "social_listening")
+        enabled = d.get("enabled", False)
+        if enabled.__class__ is not bool:
+            raise _error("enabled", "boolean", enabled)
+        return cls(enabled, _decode(BrandHealth, d.get("brand_health"), "brand_health"))
+
+    def to_dict(self):
+        out = {"enabled": self.enabled}
+        if self.brand_health is not None:
+            out["brand_health"] = self.brand_health.to_dict()
+        return out
+
+
+@dataclass(slots=True)
+class BrandData:
+    # Each report section is None when it was not selected for the brand
+    competitor_analysis: CompetitorAnalysis = None
+    google_trends: GoogleTrends = None
+    web_traffic: WebTraffic = None
+    social_listening: SocialListening = None
+    meta_platform: str = None
+    google_analytics: str = None
+    meta_campaigns: str = None
+    google_ads: str = None
+
+    @classmethod
+    def from_dict(cls, d):
+        d = _dict(d, "data")
+        get = d.get
+        return cls(
+            _decode(CompetitorAnalysis, get("competitor_analysis"), "competitor_analysis"),
+            _decode(GoogleTrends, get("google_trends"), "google_trends"),
+            _decode(WebTraffic, get("web_traffic"), "web_traffic"),
+            _decode(SocialListening, get("social_listening"), "social_listening"),
+            _opt_str(get("meta_platform"), "meta_platform"),
+            _opt_str(get("google_analytics"), "google_analytics"),
+            _opt_str(get("meta_campaigns"), "meta_campaigns"),
+            _opt_str(get("google_ads"), "google_ads"),
+        )
+
+    def to_dict(self):
+        out = {}
+        if self.competitor_analysis is not None:
+            out["competitor_analysis"] = self.competitor_analysis.to_dict()
+        if self.google_trends is not None:
+            out["google_trends"] = self.google_trends.to_dict()
+        if self.web_traffic is not None:
+            out["web_traffic"] = self.web_traffic.to_dict()
+        if self.social_listening is not None:
+            out["social_listening"] = self.social_listening.to_dict()
+        for key in PLATFORM_ACCESS_KEYS:
+            value = getattr(self, key)
+            if value is not None:
+                out[key] = value
+        return out
+
+    @property
+    def competitors(self):
+        return self.competitor_analysis.competitors if self.competitor_analysis else []
+
+
+@dataclass(slots=True)
+class Brand:
+    name: str
+    data: BrandData = field(default_factory=BrandData)
+
+    @classmethod
+    def from_dict(cls, d):
+        d = _dict(d, "brand")
+        return cls(_str(d.get("name"), "name"), _decode(BrandData, d.get("data", {}), "data"))
+
+    def to_dict(self):
+        return {"name": self.name, "data": self.data.to_dict()}
+
+
+# Top-level keys in the order add_client_record has always written them
+_RECORD_KEYS = frozenset(("executive_name", "organization", "brands", "reports", "onboard_date",
+                          "presentation_date", "type", "id", "created_at", "version"))
+
+
+@dataclass(slots=True)
+class ClientRecord:
+    organization: str
+    executive_name: str = ""
+    type: str = "onboard"
+    brands: list = field(default_factory=list)
+    reports: list = field(default_factory=list)
+    onboard_date: str = None
+    presentation_date: str = None
+    id: str = None
+    created_at: str = None
+    version: int = None
+    # Unknown top-level keys are carried through untouched
+    extra: dict = None
+
+    @classmethod
+    def from_dict(cls, d):
+        if d.__class__ is not dict:
+            raise _error("record", "object", d)
+        try:
+            get = d.get
+            version = get("version")
+            if version is not None and version.__class__ is not int:
+                raise _error("version", "integer", version)
+            extra = None
+            if len(d.keys() - _RECORD_KEYS):
+                extra = {k: v for k, v in d.items() if k not in _RECORD_KEYS}
+            return cls(
+                _str(get("organization"), "organization"),
+                _intern(_str(get("executive_name", ""), "executive_name")),
+                _intern(_str(get("type", "onboard"), "type")),
+                _decode_list(Brand, get("brands"), "brands"),
+                _str_list(get("reports"), "reports", intern=True),
+                _opt_str(get("onboard_date"), "onboard_date"),
+                _opt_str(get("presentation_date"), "presentation_date"),
+                _opt_str(get("id"), "id"),
+                _opt_str(get("created_at"), "created_at"),
+                version,
+                extra,
+            )
+        except RecordValidationError as e:
+            raise e.prefixed(f"record[{d.get('organization')!r}]")
+
+    def to_dict(self):
+        out = {
+            "executive_name": self.executive_name,
+            "organization": self.organization,
+            "brands": [b.to_dict() for b in self.brands],
+            "reports": list(self.reports),
+        }
+        if self.onboard_date is not None:
+            out["onboard_date"] = self.onboard_date
+        if self.presentation_date is not None:
+            out["presentation_date"] = self.presentation_date
+        out["type"] = self.type
+        if self.id is not None:
+            out["id"] = self.id
+        if self.created_at is not None:
+            out["created_at"] = self.created_at
+        if self.version is not None:
+            out["version"] = self.version
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    @property
+    def date(self):
+        return self.onboard_date or self.presentation_date
+
+    def get_brand(self, name):
+        return next((b for b in self.brands if b.name == name), None)
+
+
+def decode_records(raw_records):
+    return [ClientRecord.from_dict(d) for d in raw_records]
+
+
+class LazyRecords(MutableSequence):
+    """
+    A list of ClientRecords over a list of stored dicts, decoding each record
+    on first access (validation errors surface then too). to_raw() encodes
+    back, passing never-decoded records through untouched.
+    """
+    __slots__ = ("_raw", "_decoded")
+
+    def __init__(self, raw_records):
+        self._raw = list(raw_records)
+        self._decoded = [None] * len(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        record = self._decoded[i]
+        if record is None:
+            record = self._decoded[i] = ClientRecord.from_dict(self._raw[i])
+        return record
+
+    def __setitem__(self, i, record):
+        if isinstance(i, slice):
+            raise TypeError("LazyRecords does not support slice assignment")
+        self._decoded[i] = record
+        self._raw[i] = None
+
+    def __delitem__(self, i):
+        del self._raw[i]
+        del self._decoded[i]
+
+    def insert(self, i, record):
+        self._raw.insert(i, None)
+        self._decoded.insert(i, record)
+
+    def to_raw(self):
+        return [raw if record is None else record.to_dict() for raw, record in zip(self._raw, self._decoded)]
+
+    def __repr__(self):
+        return f"LazyRecords({len(self)} records)"
@@ -0,0 +1,263 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+# Organization and brand name lookup for typeahead search and duplicate
+# detection. Names are normalized (accents and punctuation dropped, case
+# folded) and indexed two ways:
+#
+#   prefixes  every word-aligned suffix of a name ("acme cola", "cola"), kept
+#             in a sorted list so a typed prefix is found with a bisect
+#   trigrams  trigram -> words containing it, and word -> names containing
+#             it, for fuzzy matches (typos, reordered or missing words)
+#
+# Trigrams are indexed per distinct word rather than per name, since names
+# share most of their words. A fuzzy lookup only expands the query's rarest
+# trigrams into candidate names: a name sharing at least k of the query's n
+# trigrams must contain one of its n - k + 1 rarest ones. Its cost therefore
+# follows the number of similar names rather than the size of the portfolio.
+
+# Legal-form words that do not tell two organizations apart
+IGNORED_WORDS = {"the", "ltd", "limited", "pvt", "private", "inc", "incorporated", "plc", "llc",
+                 "co", "company", "corp", "corporation"}
+
+# Share of the query's trigrams a fuzzy typeahead match must contain
+FUZZY_MIN_SHARED = 0.6
+# Prefix matches read per requested result; the walk is in sorted order, so
+# exact matches come first and a one-letter query stays cheap
+PREFIX_SCAN = 20
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def words(text):
+    """Normalized words of a name: no accents or punctuation, case folded."""
+    text = text or ""
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return _SEPARATORS.sub(" ", text).casefold().split()
+
+
+def key_words(name_words):
+    """The words that identify an organization: legal forms such as "Ltd" dropped."""
+    kept = [w for w in name_words if w not in IGNORED_WORDS]
+    return kept or name_words
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_trigrams(word):
+    padded = f"  {word} "
+    return tuple(padded[j:j + 3] for j in range(len(padded) - 2))
+
+
+def trigrams(name_words, partial=False):
+    """
+    Trigrams of the words, each padded like "  word ". With partial=True the
+    last word may be unfinished, so its end-of-word trigram is left out.
+    """
+    grams = set()
+    for word in name_words[:-1]:
+        grams.update(_word_trigrams(word))
+    if name_words:
+        last = _word_trigrams(name_words[-1])
+        grams.update(last[:-1] if partial else last)
+    return grams
+
+
+class NameIndex:
+    """Prefix and trigram indexes over the organization and brand names of the records."""
+
+    def __init__(self):
+        self.records = {}  # id -> (organization, brand names)
+        self._term_ids = {}  # (name, kind, organization) -> term id
+        self._terms = {}  # term id -> [name, kind, organization, normalized, key words, references]
+        self._next_term = 0
+        self._word_terms = {}  # key word -> term ids
+        self._trigrams = {}  # trigram -> key words containing it
+        self._suffixes = None  # sorted "<word-aligned suffix>\0<term id>", built on first search
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, record_id, organization, brands):
+        """Indexes the names of a record, replacing its previous ones."""
+        names = (organization, tuple(b for b in brands or [] if b))
+        old = self.records.get(record_id)
+        if old is not None:
+            if old == names:
+                return
+            self.remove(record_id)
+        self.records[record_id] = names
+        # Results are organizations, so a record without one has nothing to offer
+        if not organization:
+            return
+        self._add_term(organization, "organization", organization)
+        for brand in names[1]:
+            self._add_term(brand, "brand", organization)
+
+    def remove(self, record_id):
+        names = self.records.pop(record_id, None)
+        if names is None:
+            return
+        organization, brands = names
+        if not organization:
+            return
+        self._remove_term(organization, "organization", organization)
+        for brand in brands:
+            self._remove_term(brand, "brand", organization)
+
+    @staticmethod
+    def _term_suffixes(term_id, normalized):
+        # "\0" sorts before every other character, so an exact match comes
+        # before longer names starting with it
+        name_words = normalized.split()
+        return [f"{' '.join(name_words[i:])}\0{term_id}" for i in range(len(name_words))]
+
+    def _add_term(self, name, kind, organization):
+        key = (name, kind, organization)
+        term_id = self._term_ids.get(key)
+        if term_id is not None:
+            self._terms[term_id][5] += 1
+            return
+        term_id = self._next_term
+        self._next_term += 1
+        name_words = words(name)
+        identifying = tuple(dict.fromkeys(key_words(name_words)))
+        normalized = " ".join(name_words)
+        self._term_ids[key] = term_id
+        self._terms[term_id] = [name, kind, organization, normalized, identifying, 1]
+        for word in identifying:
+            ids = self._word_terms.get(word)
+            if ids is None:
+                self._word_terms[word] = ids = set()
+                for gram in _word_trigrams(word):
+                    self._trigrams.setdefault(gram, set()).add(word)
+            ids.add(term_id)
+        if self._suffixes is not None:
+            for suffix in self._term_suffixes(term_id, normalized):
+                insort(self._suffixes, suffix)
+
+    def _remove_term(self, name, kind, organization):
+        key = (name, kind, organization)
+        term_id = self._term_ids.get(key)
+        if term_id is None:
+            return
+        term = self._terms[term_id]
+        term[5] -= 1
+        if term[5]:
+            return
+        del self._term_ids[key]
+        del self._terms[term_id]
+        for word in term[4]:
+            ids = self._word_terms[word]
+            ids.discard(term_id)
+            if not ids:
+                del self._word_terms[word]
+                for gram in _word_trigrams(word):
+                    word_set = self._trigrams[gram]
+                    word_set.discard(word)
+                    if not word_set:
+                        del self._trigrams[gram]
+        if self._suffixes is not None:
+            for suffix in self._term_suffixes(term_id, term[3]):
+                i = bisect_left(self._suffixes, suffix)
+                if i < len(self._suffixes) and self._suffixes[i] == suffix:
+                    del self._suffixes[i]
+
+    def _shared(self, grams, min_shared):
+        """term id -> number of grams its name contains, for the terms containing at least min_shared."""
+        # Bit per query trigram; a word's mask holds the query trigrams it contains
+        bits = {gram: 1 << i for i, gram in enumerate(grams)}
+        masks = {}
+        for gram, bit in bits.items():
+            for word in self._trigrams.get(gram, ()):
+                masks[word] = masks.get(word, 0) | bit
+
+        def frequency(gram):
+            return sum(len(self._word_terms[word]) for word in self._trigrams.get(gram, ()))
+
+        rare = sorted(grams, key=frequency)[:len(grams) - min_shared + 1]
+        candidates = set()
+        for gram in rare:
+            for word in self._trigrams.get(gram, ()):
+                candidates |= self._word_terms[word]
+
+        shared = {}
+        for term_id in candidates:
+            mask = 0
+            for word in self._terms[term_id][4]:
+                mask |= masks.get(word, 0)
+            count = mask.bit_count()
+            if count >= min_shared:
+                shared[term_id] = count
+        return shared
+
+    @staticmethod
+    def _offer(best, term, score):
+        organization = term[2]
+        current = best.get(organization)
+        # On equal scores the organization's own name beats one of its brands
+        if current is None or (score, term[1] == "organization") > (current[0], current[2] == "organization"):
+            best[organization] = (score, term[0], term[1])
+
+    @staticmethod
+    def _results(best, limit):
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0].casefold()))
+        return [{"organization": organization, "match": name, "kind": kind, "score": round(score, 3)}
+                for organization, (score, name, kind) in ranked[:limit]]
+
+    def search(self, text, limit=20):
+        """
+        Typeahead lookup: organizations whose name, or one of whose brand
+        names, starts with the text or has a word starting with it, followed
+        by fuzzy matches when there are fewer than limit of those. Returns up
+        to limit dicts (organization, match, kind, score), best first.
+        """
+        query_words = words(text)
+        if not query_words:
+            return []
+        query = " ".join(query_words)
+        best = {}
+
+        if self._suffixes is None:
+            self._suffixes = sorted(suffix for term_id, term in self._terms.items()
+                                    for suffix in self._term_suffixes(term_id, term[3]))
+        i = bisect_left(self._suffixes, query)
+        stop = min(len(self._suffixes), i + limit * PREFIX_SCAN)
+        while i < stop and self._suffixes[i].startswith(query):
+            term = self._terms[int(self._suffixes[i].rpartition("\0")[2])]
+            if term[3] == query:
+                score = 1.0
+            elif term[3].startswith(query):
+                score = 0.9
+            else:
+                score = 0.8
+            self._offer(best, term, score)
+            i += 1
+
+        if len(best) < limit:
+            grams = trigrams(key_words(query_words), partial=True)
+            if grams:
+                min_shared = max(1, int(len(grams) * FUZZY_MIN_SHARED + 0.999))
+                for term_id, count in self._shared(grams, min_shared).items():
+                    self._offer(best, self._terms[term_id], 0.7 * count / len(grams))
+        return self._results(best, limit)
+
+    def similar(self, name, threshold=0.5, limit=5):
+        """
+        Organizations whose name or brand names look like name (trigram
+        Jaccard similarity of at least threshold, legal forms such as "Ltd"
+        ignored), most similar first. Same dicts as search().
+        """
+        grams = trigrams(key_words(words(name)))
+        if not grams:
+            return []
+        min_shared = max(1, int(len(grams) * threshold + 0.999))
+        best = {}
+        for term_id, count in self._shared(grams, min_shared).items():
+            term = self._terms[term_id]
+            score = count / (len(grams) + len(trigrams(term[4])) - count)
+            if score >= threshold:
+                self._offer(best, term, score)
+        return self._results(best, limit)
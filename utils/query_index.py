@@ -0,0 +1,171 @@
+from bisect import bisect_left, bisect_right, insort
+
+# Secondary indexes over the stored records for data_manager.query().
+# Every record is reduced to a few query fields (see fields()); the index maps
+# each value back to the ids holding it, and keeps record dates in a sorted
+# list for range lookups. A query intersects the id sets of its filters,
+# smallest first, so its cost depends on the number of matches rather than
+# the size of the portfolio, and no record outside the result is read.
+
+# Positions of the query fields in the list returned by fields()
+TYPE, EXECUTIVE, DATE, REPORTS, SOCIAL_LISTENING = range(5)
+
+
+def fields(raw):
+    """The query fields of a raw record, in a JSON-friendly list."""
+    social_listening = False
+    for brand in raw.get("brands") or []:
+        sl = (brand.get("data") or {}).get("social_listening")
+        if isinstance(sl, dict) and sl.get("enabled"):
+            social_listening = True
+            break
+    return [
+        raw.get("type"),
+        raw.get("executive_name"),
+        raw.get("presentation_date") or raw.get("onboard_date"),
+        list(raw.get("reports") or []),
+        social_listening,
+    ]
+
+
+def _key(value):
+    # Executive names are matched case-insensitively
+    return value.strip().casefold() if isinstance(value, str) else value
+
+
+def _as_list(value):
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+class QueryIndex:
+    """Value -> ids maps for the query fields, maintained record by record."""
+
+    def __init__(self):
+        self.records = {}  # id -> (position, fields)
+        self.by_type = {}
+        self.by_executive = {}
+        self.by_report = {}
+        self.social_listening = set()
+        self.dates = []  # sorted (date, id)
+        self._next_position = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    @staticmethod
+    def _add_to(index, value, record_id):
+        ids = index.get(value)
+        if ids is None:
+            index[value] = ids = set()
+        ids.add(record_id)
+
+    @staticmethod
+    def _remove_from(index, value, record_id):
+        ids = index.get(value)
+        if ids is not None:
+            ids.discard(record_id)
+            if not ids:
+                del index[value]
+
+    def add(self, record_id, record_fields):
+        """Indexes a record, replacing its previous fields (it keeps its position)."""
+        old = self.records.get(record_id)
+        if old is not None:
+            if old[1] == record_fields:
+                return
+            position = old[0]
+            self.remove(record_id)
+        else:
+            position = self._next_position
+            self._next_position += 1
+
+        self.records[record_id] = (position, record_fields)
+        self._add_to(self.by_type, record_fields[TYPE], record_id)
+        self._add_to(self.by_executive, _key(record_fields[EXECUTIVE]), record_id)
+        for report in record_fields[REPORTS]:
+            self._add_to(self.by_report, report, record_id)
+        if record_fields[SOCIAL_LISTENING]:
+            self.social_listening.add(record_id)
+        if record_fields[DATE]:
+            insort(self.dates, (record_fields[DATE], record_id))
+
+    def remove(self, record_id):
+        old = self.records.pop(record_id, None)
+        if old is None:
+            return
+        record_fields = old[1]
+        self._remove_from(self.by_type, record_fields[TYPE], record_id)
+        self._remove_from(self.by_executive, _key(record_fields[EXECUTIVE]), record_id)
+        for report in record_fields[REPORTS]:
+            self._remove_from(self.by_report, report, record_id)
+        self.social_listening.discard(record_id)
+        if record_fields[DATE]:
+            i = bisect_left(self.dates, (record_fields[DATE], record_id))
+            if i < len(self.dates) and self.dates[i] == (record_fields[DATE], record_id):
+                del self.dates[i]
+
+    def _union(self, index, values):
+        ids = set()
+        for value in values:
+            ids |= index.get(value, set())
+        return ids
+
+    def query(self, type=None, executive=None, date_from=None, date_to=None, report=None,
+              has_social_listening=None):
+        """
+        Returns the ids of the matching records in store order. type, executive
+        and report take one value or a list (any of); dates are ISO strings or
+        date objects, both ends inclusive. Filters left as None are ignored.
+        """
+        candidates = []
+        types = _as_list(type)
+        if types is not None:
+            candidates.append(self._union(self.by_type, types))
+        executives = _as_list(executive)
+        if executives is not None:
+            candidates.append(self._union(self.by_executive, [_key(e) for e in executives]))
+        reports = _as_list(report)
+        if reports is not None:
+            candidates.append(self._union(self.by_report, reports))
+        if date_from is not None or date_to is not None:
+            lo = bisect_left(self.dates, (str(date_from),)) if date_from is not None else 0
+            # "\uffff" sorts after every id, so records dated date_to are included
+            hi = bisect_right(self.dates, (str(date_to), "\uffff")) if date_to is not None else len(self.dates)
+            candidates.append({record_id for _, record_id in self.dates[lo:hi]})
+
+        if has_social_listening is True:
+            candidates.append(self.social_listening)
+
+        if candidates:
+            candidates.sort(key=len)
+            ids = set(candidates[0])
+            for other in candidates[1:]:
+                if not ids:
+                    break
+                ids &= other
+        else:
+            ids = set(self.records)
+
+        if has_social_listening is False:
+            ids -= self.social_listening
+
+        return sorted(ids, key=lambda record_id: self.records[record_id][0])
+
+    def facets(self):
+        """Distinct values per field, for filter widgets."""
+        executives = {}
+        for _, record_fields in self.records.values():
+            name = record_fields[EXECUTIVE]
+            if name:
+                executives.setdefault(_key(name), name)
+        return {
+            "types": sorted(t for t in self.by_type if t),
+            "executives": sorted(executives.values()),
+            "reports": sorted(self.by_report),
+            "date_min": self.dates[0][0] if self.dates else None,
+            "date_max": self.dates[-1][0] if self.dates else None,
+        }
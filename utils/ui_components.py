@@ -1,5 +1,50 @@
 import streamlit as st
-import pandas as pd
+from utils import data_manager
+
+# Above this many organizations the picker lists none until a search is typed
+MAX_PICKER_OPTIONS = 500
+
+def render_organization_picker(key_prefix):
+    """
+    Renders a search box and a selectbox for choosing an existing
+    organization. The search matches organization and brand names and
+    tolerates typos. Returns the selected organization, or "".
+    """
+    search = st.text_input("Search Organizations", key=f"{key_prefix}_org_search",
+                           placeholder="Type part of an organization or brand name")
+    via_brand = {}
+    if search.strip():
+        matches = data_manager.search_organizations(search, limit=50)
+        options = [m["organization"] for m in matches]
+        via_brand = {m["organization"]: m["match"] for m in matches if m["kind"] == "brand"}
+        if not options:
+            st.info("No organization or brand name matches the search.")
+    else:
+        options = data_manager.get_all_organizations()
+        if len(options) > MAX_PICKER_OPTIONS:
+            st.caption(f"{len(options)} organizations; type in the search box to find one.")
+            options = []
+
+    def label(org):
+        return f"{org} (brand: {via_brand[org]})" if org in via_brand else org
+
+    return st.selectbox("Select Organization", [""] + options, format_func=label, key=f"{key_prefix}_org_select")
+
+def render_duplicate_warning(org_name):
+    """Warns when existing organizations or brands have names like org_name."""
+    if not org_name.strip():
+        return
+    similar = data_manager.find_similar_organizations(org_name)
+    if not similar:
+        return
+    lines = []
+    for m in similar:
+        if m["kind"] == "brand":
+            lines.append(f"- {m['organization']} (brand: {m['match']})")
+        else:
+            lines.append(f"- {m['organization']}")
+    st.warning("Organizations with similar names already exist. If this is one of them, "
+               "add the brands on the Update Client page instead:\n" + "\n".join(lines))
 
 def render_brand_input(key_prefix="onboard"):
     """
@@ -9,6 +54,7 @@ def render_brand_input(key_prefix="onboard"):
     col1, col2 = st.columns([2, 1])
     with col1:
         org_name = st.text_input("Organization Name", key=f"{key_prefix}_org_name")
+    render_duplicate_warning(org_name)
     
     st.subheader("Brands")
     
@@ -150,7 +196,7 @@ def render_social_listening_form(brand_name, competitors, key_prefix):
         # Display Keywords Table
         if st.session_state[f"{key_prefix}_keywords"]:
             st.markdown("**Keywords List**")
-            kw_df = pd.DataFrame(st.session_state[f"{key_prefix}_keywords"], columns=["Keywords"])
+            kw_df = {"Keywords": st.session_state[f"{key_prefix}_keywords"]}
             st.table(kw_df)
 
         # Hashtags
@@ -173,7 +219,7 @@ def render_social_listening_form(brand_name, competitors, key_prefix):
         # Display Hashtags Table
         if st.session_state[f"{key_prefix}_hashtags"]:
             st.markdown("**Hashtags List**")
-            ht_df = pd.DataFrame(st.session_state[f"{key_prefix}_hashtags"], columns=["Hashtags"])
+            ht_df = {"Hashtags": st.session_state[f"{key_prefix}_hashtags"]}
             st.table(ht_df)
             
         data["brand_health"] = {
@@ -0,0 +1,357 @@
+import json
+import os
+import re
+from datetime import datetime
+
+# Every record keeps an append-only log in <history_dir>/<record_id>.jsonl.
+# Each line is one version: either a full checkpoint of the record or a delta
+# against the previous version. A checkpoint is written every
+# CHECKPOINT_INTERVAL versions, so reading any version costs one checkpoint
+# plus at most CHECKPOINT_INTERVAL - 1 deltas.
+CHECKPOINT_INTERVAL = 10
+
+# Fields that are bookkeeping on the stored record and not part of its history
+UNTRACKED_FIELDS = ("version",)
+
+
+def _history_path(history_dir, record_id):
+    return os.path.join(history_dir, f"{record_id}.jsonl")
+
+
+def _strip(record):
+    return {k: v for k, v in record.items() if k not in UNTRACKED_FIELDS}
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(",", ":"))
+
+
+# --- Deltas -----------------------------------------------------------------
+# A delta is a list of operations on paths (lists of dict keys / list indices):
+#   ["set", path, value]   replace or insert the value at path
+#   ["del", path]          remove a dict key
+#   ["trunc", path, n]     truncate the list at path to n items
+# Only changed leaves are stored, so unchanged parts of a record are never
+# duplicated between versions.
+
+def diff(old, new, path=None):
+    path = path or []
+    if type(old) is not type(new):
+        return [["set", path, new]]
+
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append(["del", path + [key]])
+        for key, value in new.items():
+            if key not in old:
+                ops.append(["set", path + [key], value])
+            else:
+                ops.extend(diff(old[key], value, path + [key]))
+        return ops
+
+    if isinstance(old, list):
+        ops = []
+        common = min(len(old), len(new))
+        for i in range(common):
+            ops.extend(diff(old[i], new[i], path + [i]))
+        for i in range(common, len(new)):
+            ops.append(["set", path + [i], new[i]])
+        if len(new) < len(old):
+            ops.append(["trunc", path, len(new)])
+        # Replacing the whole list is cheaper than many scattered edits
+        if ops and len(_dumps(ops)) > len(_dumps(new)):
+            return [["set", path, new]]
+        return ops
+
+    if old != new:
+        return [["set", path, new]]
+    return []
+
+
+def _copy_container(node):
+    return dict(node) if isinstance(node, dict) else list(node)
+
+
+def apply_delta(doc, ops):
+    """
+    Applies a delta to doc without mutating it. Only the containers along each
+    changed path are copied (path copying), so the result shares every
+    untouched subtree with doc.
+    """
+    root = {"": doc}
+    copied = set()
+
+    for op in ops:
+        kind, path = op[0], [""] + op[1]
+        parent = root
+        # Walk down, copying each container on the way the first time we see it
+        for depth in range(len(path) - 1):
+            key = path[depth]
+            child = parent[key]
+            marker = (id(parent), key)
+            if marker not in copied:
+                child = _copy_container(child)
+                parent[key] = child
+                copied.add(marker)
+                copied.add(id(child))
+            parent = child
+
+        key = path[-1]
+        if kind == "set":
+            if isinstance(parent, list) and key == len(parent):
+                parent.append(op[2])
+            else:
+                parent[key] = op[2]
+        elif kind == "del":
+            parent.pop(key, None)
+        elif kind == "trunc":
+            target = parent[key]
+            if id(target) not in copied:
+                target = _copy_container(target)
+                parent[key] = target
+                copied.add(id(target))
+            del target[op[2]:]
+
+    return root[""]
+
+
+# --- History log ------------------------------------------------------------
+
+_VERSION_PREFIX = re.compile(rb'\{"v":(-?\d+)[,}]')
+
+
+def _read_lines(history_dir, record_id):
+    path = _history_path(history_dir, record_id)
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        return [line for line in f.read().splitlines() if line.strip()]
+
+
+def _materialize(lines, index):
+    # Walk back to the nearest checkpoint, then replay deltas forward
+    start = index
+    entries = []
+    while start >= 0:
+        entry = json.loads(lines[start])
+        entries.append(entry)
+        if "checkpoint" in entry:
+            break
+        start -= 1
+    if start < 0:
+        raise ValueError("History log has no checkpoint")
+
+    entries.reverse()
+    doc = entries[0]["checkpoint"]
+    for entry in entries[1:]:
+        if "checkpoint" in entry:
+            doc = entry["checkpoint"]
+        else:
+            doc = apply_delta(doc, entry.get("delta", []))
+    return doc
+
+
+def _line_version(line):
+    # Entries are written with "v" first; only parse the whole line if not
+    match = _VERSION_PREFIX.match(line)
+    return int(match.group(1)) if match else json.loads(line)["v"]
+
+
+def _line_index(lines, version):
+    # Concurrent writers can log the same version twice, so versions are not
+    # line positions; the last line with the version holds its final state
+    for index in range(len(lines) - 1, -1, -1):
+        if _line_version(lines[index]) == version:
+            return index
+    return None
+
+
+def append_version(history_dir, record_id, version, new_record, old_record=None, op="update"):
+    """
+    Appends a version of a record to its history log. old_record is the
+    previous stored state; it is written as the base checkpoint if the record
+    has no history yet (e.g. records created before history was kept).
+    """
+    if not os.path.exists(history_dir):
+        os.makedirs(history_dir, exist_ok=True)
+
+    lines = _read_lines(history_dir, record_id)
+    now = datetime.now().isoformat()
+    out = []
+
+    if not lines and old_record is not None and version > 1:
+        out.append({"v": version - 1, "ts": now, "op": "seed", "checkpoint": _strip(old_record)})
+        lines = [None]
+
+    new_doc = _strip(new_record)
+    entry = {"v": version, "ts": now, "op": op}
+    if not lines or (version - 1) % CHECKPOINT_INTERVAL == 0:
+        entry["checkpoint"] = new_doc
+    else:
+        if old_record is not None:
+            base = _strip(old_record)
+        else:
+            base = _materialize(lines, len(lines) - 1)
+        ops = diff(base, new_doc)
+        # Fall back to a checkpoint when the delta would not be smaller
+        if len(_dumps(ops)) >= len(_dumps(new_doc)):
+            entry["checkpoint"] = new_doc
+        else:
+            entry["delta"] = ops
+    out.append(entry)
+
+    with open(_history_path(history_dir, record_id), "a") as f:
+        for e in out:
+            f.write(_dumps(e) + "\n")
+
+
+def append_marker(history_dir, record_id, version, op):
+    """Records an event (e.g. a delete) that does not change the record data."""
+    if not os.path.exists(history_dir):
+        os.makedirs(history_dir, exist_ok=True)
+    entry = {"v": version, "ts": datetime.now().isoformat(), "op": op, "delta": []}
+    with open(_history_path(history_dir, record_id), "a") as f:
+        f.write(_dumps(entry) + "\n")
+
+
+def list_versions(history_dir, record_id):
+    versions = []
+    for line in _read_lines(history_dir, record_id):
+        entry = json.loads(line)
+        versions.append({
+            "version": entry["v"],
+            "timestamp": entry.get("ts"),
+            "op": entry.get("op"),
+            "checkpoint": "checkpoint" in entry,
+        })
+    return versions
+
+
+def latest_version(history_dir, record_id):
+    lines = _read_lines(history_dir, record_id)
+    if not lines:
+        return None
+    return json.loads(lines[-1])["v"]
+
+
+def last_modified(history_dir, record_id, ignore_ops=("seed",)):
+    """
+    Timestamp (ISO string) of the last logged change, or None. Entries that
+    only seed history for an existing state (op "seed": reindex, deletes and
+    imports of records without history) are skipped; imported changes count.
+    """
+    for line in reversed(_read_lines(history_dir, record_id)):
+        entry = json.loads(line)
+        if entry.get("op") not in ignore_ops:
+            return entry.get("ts")
+    return None
+
+
+def get_version(history_dir, record_id, version):
+    lines = _read_lines(history_dir, record_id)
+    index = _line_index(lines, version)
+    if index is None:
+        return None
+    record = _materialize(lines, index)
+    record = dict(record)
+    record["version"] = version
+    return record
+
+
+def _format_path(path):
+    out = ""
+    for part in path:
+        if isinstance(part, int):
+            out += f"[{part}]"
+        else:
+            out += f".{part}" if out else str(part)
+    return out
+
+
+def _lookup(doc, path):
+    for part in path:
+        try:
+            doc = doc[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return doc
+
+
+def describe(old, new):
+    """Readable changes from one record state to another: a list of {path, old, new} dicts."""
+    changes = []
+    for op in diff(old, new):
+        kind, path = op[0], op[1]
+        if kind == "set":
+            changes.append({"path": _format_path(path), "old": _lookup(old, path), "new": op[2]})
+        elif kind == "del":
+            changes.append({"path": _format_path(path), "old": _lookup(old, path), "new": None})
+        elif kind == "trunc":
+            removed = _lookup(old, path)[op[2]:]
+            changes.append({"path": _format_path(path), "old": removed, "new": f"(truncated to {op[2]} items)"})
+    return changes
+
+
+def diff_versions(history_dir, record_id, version_a, version_b):
+    """Returns the changes from version_a to version_b as a list of dicts."""
+    old = get_version(history_dir, record_id, version_a)
+    new = get_version(history_dir, record_id, version_b)
+    if old is None or new is None:
+        return None
+    return describe(_strip(old), _strip(new))
+
+
+def compact(history_dir, record_id, keep=None):
+    """
+    Rewrites a history log with checkpoints back on the regular spacing,
+    optionally keeping only the last `keep` versions. Returns the file size
+    before and after.
+    """
+    path = _history_path(history_dir, record_id)
+    lines = _read_lines(history_dir, record_id)
+    old_size = os.path.getsize(path)
+    if not lines:
+        return old_size, old_size
+
+    start = max(0, len(lines) - keep) if keep else 0
+    doc = _materialize(lines, start)
+    out = []
+    for i in range(start, len(lines)):
+        entry = json.loads(lines[i])
+        if i > start:
+            if "checkpoint" in entry:
+                new_doc = entry.pop("checkpoint")
+            else:
+                new_doc = apply_delta(doc, entry.pop("delta", []))
+        else:
+            entry.pop("checkpoint", None)
+            entry.pop("delta", None)
+            new_doc = doc
+        if i == start or (entry["v"] - 1) % CHECKPOINT_INTERVAL == 0:
+            entry["checkpoint"] = new_doc
+        else:
+            ops = diff(doc, new_doc)
+            if ops and len(_dumps(ops)) >= len(_dumps(new_doc)):
+                entry["checkpoint"] = new_doc
+            else:
+                entry["delta"] = ops
+        doc = new_doc
+        out.append(_dumps(entry))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write("\n".join(out) + "\n")
+    os.replace(tmp_path, path)
+    return old_size, os.path.getsize(path)
+
+
+def storage_stats(history_dir, record_id):
+    """Compares the size of the delta log to storing every version in full."""
+    lines = _read_lines(history_dir, record_id)
+    log_bytes = sum(len(line) + 1 for line in lines)
+    full_bytes = 0
+    for i in range(len(lines)):
+        full_bytes += len(_dumps(_materialize(lines, i)))
+    return {"versions": len(lines), "log_bytes": log_bytes, "full_copy_bytes": full_bytes}
@@ -0,0 +1,133 @@
+import streamlit as st
+from utils import archive
+
+POLICY_COLUMNS = ["name", "types", "date_field", "older_than_days", "inactive_days"]
+
+def _policies_to_rows(policies):
+    rows = []
+    for p in policies:
+        rows.append({
+            "name": p.get("name", ""),
+            "types": ", ".join(p.get("types") or []),
+            "date_field": p.get("date_field", "date"),
+            "older_than_days": p.get("older_than_days"),
+            "inactive_days": p.get("inactive_days"),
+        })
+    return rows
+
+def _rows_to_policies(rows):
+    policies = []
+    for row in rows:
+        if not row.get("name"):
+            continue
+        policy = {"name": row["name"]}
+        types = [t.strip() for t in str(row.get("types") or "").split(",") if t.strip()]
+        if types:
+            policy["types"] = types
+        if row.get("date_field") and row["date_field"] != "date":
+            policy["date_field"] = row["date_field"]
+        for key in ("older_than_days", "inactive_days"):
+            value = row.get(key)
+            # Empty cells come back as None or NaN
+            if value is not None and value == value:
+                policy[key] = int(value)
+        policies.append(policy)
+    return policies
+
+def render():
+    # pandas is only needed once this page is opened
+    import pandas as pd
+
+    st.header("Archive")
+    st.write("Rarely opened records (old pitches, inactive clients) can be moved into compressed cold storage. "
+             "They no longer slow down the other pages, but stay searchable here and can be restored at any time.")
+
+    stats = archive.stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Archived Records", stats["cold_records"])
+    col2.metric("Cold Segments", stats["cold_segments"])
+    col3.metric("Cold Storage", f"{stats['cold_bytes'] / 1e6:.1f} MB")
+
+    # Policies
+    st.subheader("Archive Policies")
+    st.info("A record is archived when it meets every condition of any policy. "
+            "types: comma separated record types; date_field: date, presentation_date or onboard_date; "
+            "older_than_days: age of that date; inactive_days: days since the record was last changed.")
+    policies_df = pd.DataFrame(_policies_to_rows(archive.load_policies()), columns=POLICY_COLUMNS)
+    edited = st.data_editor(policies_df, key="archive_policies", num_rows="dynamic", use_container_width=True)
+    policies = _rows_to_policies(edited.to_dict("records"))
+
+    col_save, col_preview, col_run = st.columns(3)
+    with col_save:
+        if st.button("Save Policies", key="archive_save_policies"):
+            try:
+                archive.save_policies(policies)
+                st.success("Policies saved.")
+            except ValueError as e:
+                st.error(str(e))
+    with col_preview:
+        if st.button("Preview Archive Run", key="archive_preview"):
+            try:
+                summary = archive.archive(policies, dry_run=True)
+                st.write(f"{summary['archived']} of {summary['scanned']} records would be archived.")
+                if summary["by_policy"]:
+                    st.table({"Policy": list(summary["by_policy"]), "Records": list(summary["by_policy"].values())})
+            except ValueError as e:
+                st.error(str(e))
+    with col_run:
+        if st.button("Archive Now", key="archive_run"):
+            try:
+                summary = archive.archive(policies)
+                st.success(f"Archived {summary['archived']} of {summary['scanned']} records.")
+                if summary["changed_during_run"]:
+                    st.info(f"{summary['changed_during_run']} records were saved while archiving "
+                            "and stay in the active store.")
+                if summary["archived"] and summary["hot_bytes_after"] < summary["hot_bytes_before"]:
+                    st.write(f"Active store: {summary['hot_bytes_before'] / 1e6:.1f} MB -> "
+                             f"{summary['hot_bytes_after'] / 1e6:.1f} MB")
+                elif summary["archived"]:
+                    # jsonl drops archived records with tombstones; compacting reclaims the space
+                    st.write("Run `python cli.py compact` to shrink the active store.")
+            except ValueError as e:
+                st.error(str(e))
+
+    # Search and restore
+    st.markdown("---")
+    st.subheader("Search Archived Records")
+    col_text, col_type = st.columns([2, 1])
+    with col_text:
+        text = st.text_input("Organization or brand name", key="archive_search_text")
+    with col_type:
+        types = st.multiselect("Type", ["onboard", "pitch"], key="archive_search_types")
+
+    results = archive.search(text, types=types, limit=500)
+    if not results:
+        st.info("No archived records match.")
+        return
+
+    st.dataframe(pd.DataFrame([{
+        "Organization": r["organization"],
+        "Type": r["type"],
+        "Date": r["date"],
+        "Brands": ", ".join(b for b in r["brands"] if b),
+        "Archived": (r.get("archived_at") or "")[:10],
+        "Policy": r.get("policy"),
+    } for r in results]), use_container_width=True)
+    if len(results) == 500:
+        st.caption("Showing the first 500 matches; refine the search to see more.")
+
+    labels = {f"{r['organization']} ({r['type']}, {r['date']})": r["id"] for r in results}
+    selected = st.selectbox("Select Archived Record", [""] + list(labels), key="archive_selected")
+    if selected:
+        record_id = labels[selected]
+        with st.expander("Record Data"):
+            raw = archive.get_raw(record_id)
+            if raw is not None:
+                st.json(raw)
+        if st.button("Restore to Active Store", key="archive_restore"):
+            restored = archive.restore(record_id)
+            if restored is not None:
+                st.success(f"Restored {restored.organization}.")
+                st.rerun()
+            else:
+                st.error("This record is no longer in the archive.")
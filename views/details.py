@@ -0,0 +1,97 @@
+import streamlit as st
+from utils import columnar_export, data_manager
+
+def render():
+    # pandas is only needed once this page is opened
+    import pandas as pd
+
+    st.header("Client Data Overview")
+
+    # Filters are answered by data_manager's secondary indexes, so only the
+    # matching records are read
+    facets = data_manager.query_facets()
+    with st.expander("Filters", expanded=True):
+        col_f1, col_f2, col_f3 = st.columns(3)
+        with col_f1:
+            types = st.multiselect("Type", facets["types"], key="details_types")
+            executives = st.multiselect("Executive", facets["executives"], key="details_executives")
+        with col_f2:
+            date_from = st.date_input("From date", value=None, key="details_date_from")
+            date_to = st.date_input("To date", value=None, key="details_date_to")
+        with col_f3:
+            reports = st.multiselect("Report", facets["reports"], key="details_reports")
+            social_listening = st.selectbox("Social Listening", ["Any", "Enabled", "Not enabled"], key="details_sl")
+
+    data = list(data_manager.query(
+        type=types or None,
+        executive=executives or None,
+        date_from=date_from,
+        date_to=date_to,
+        report=reports or None,
+        has_social_listening={"Enabled": True, "Not enabled": False}.get(social_listening),
+    ))
+    st.caption(f"{len(data)} records")
+    
+    if data:
+        # Flatten data for display
+        flat_data = []
+        for r in data:
+            for b in r.brands:
+                flat_data.append({
+                    "Organization": r.organization,
+                    "Type": r.type,
+                    "Date": r.date,
+                    "Brand": b.name,
+                    "Reports": ", ".join(r.reports)
+                })
+        
+        df = pd.DataFrame(flat_data)
+        st.dataframe(df, use_container_width=True)
+        
+        csv = df.to_csv(index=False).encode('utf-8')
+        st.download_button(
+            "Export to CSV",
+            csv,
+            "clients_data.csv",
+            "text/csv",
+            key='download-csv'
+        )
+
+        # Columnar export of the full normalized portfolio (organizations,
+        # brands, competitors, socials, keywords, hashtags, platform access)
+        st.markdown("---")
+        st.subheader("Columnar Export for BI")
+        col_fmt, col_btn = st.columns([1, 2])
+        with col_fmt:
+            fmt = st.radio("Format", ["parquet", "arrow"], horizontal=True, key="columnar_format")
+        with col_btn:
+            if st.button("Prepare Columnar Export", key="columnar_prepare"):
+                try:
+                    st.session_state["columnar_export"] = (fmt, columnar_export.export_portfolio_zip(fmt))
+                except ImportError as e:
+                    st.error(str(e))
+
+        prepared = st.session_state.get("columnar_export")
+        if prepared and prepared[0] == fmt:
+            st.download_button(
+                f"Download {fmt.title()} Tables (zip)",
+                prepared[1],
+                f"clients_{fmt}.zip",
+                "application/zip",
+                key="download-columnar"
+            )
+        
+        # Excel export requires openpyxl
+        # buffer = io.BytesIO()
+        # with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        #     df.to_excel(writer, index=False)
+        # st.download_button(
+        #     "Export to Excel",
+        #     buffer,
+        #     "clients_data.xlsx",
+        #     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        #     key='download-excel'
+        # )
+        
+    else:
+        st.info("No data available.")
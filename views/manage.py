@@ -0,0 +1,237 @@
+import streamlit as st
+from utils import data_manager, excel_import, ui_components
+from utils.excel_export import generate_excel
+from utils.models import BrandHealth, Competitor, CompetitorAnalysis, GoogleTrends, PLATFORMS, PLATFORM_ACCESS_KEYS, SocialListening, Socials, WebTraffic
+
+CONFLICT_MESSAGE = ("Someone else saved this organization while you were editing it, so your change was "
+                    "not saved. Review the latest data and make your change again.")
+
+def render():
+    # pandas is only needed once this page is opened
+    import pandas as pd
+
+    st.header("Manage Existing Clients")
+
+    # Offline edits: upload a "Detailed Data" workbook downloaded from this
+    # app, preview what changed against the stored records and apply it
+    with st.expander("Apply Edits from an Excel Workbook"):
+        uploaded = st.file_uploader("Edited workbook (.xlsx)", type=["xlsx"], key="excel_import_file")
+        if uploaded is not None:
+            # file_id is new for every upload, so re-uploading an edited
+            # workbook with the same name and size still gets a fresh plan
+            plan_key = uploaded.file_id
+            if st.session_state.get("excel_import_key") != plan_key:
+                try:
+                    st.session_state["excel_import_plan"] = excel_import.plan_import(uploaded)
+                except ValueError as e:
+                    st.session_state["excel_import_plan"] = None
+                    st.error(str(e))
+                st.session_state["excel_import_key"] = plan_key
+
+            plan = st.session_state.get("excel_import_plan")
+            if plan:
+                st.write(f"{plan['rows']} rows read, {len(plan['changes'])} records changed.")
+                if plan["issues"]:
+                    st.warning(f"{len(plan['issues'])} rows could not be applied.")
+                    st.dataframe(pd.DataFrame(plan["issues"], columns=["Row", "Problem"]), use_container_width=True)
+                if plan["changes"]:
+                    st.dataframe(pd.DataFrame([
+                        {"Organization": c["organization"], "Type": c["type"], "Field": d["path"], "Old": str(d["old"]), "New": str(d["new"])}
+                        for c in plan["changes"] for d in c["diff"]
+                    ]), use_container_width=True)
+                    if st.button(f"Apply {len(plan['changes'])} Changes", key="excel_import_apply"):
+                        updated, conflicts = excel_import.apply_import(plan)
+                        if updated:
+                            st.success(f"Updated {len(updated)} records.")
+                        if conflicts:
+                            st.error(f"{len(conflicts)} records were changed by someone else since the workbook "
+                                     "was read and were not updated. Upload the workbook again to review them.")
+                        st.session_state["excel_import_key"] = None
+                else:
+                    st.info("The workbook matches the stored data; nothing to apply.")
+    
+    selected_org = ui_components.render_organization_picker("manage")
+    
+    if selected_org:
+        record = data_manager.get_record_by_org(selected_org)
+        if record:
+            # Filter brands for this org
+            brand_names = [b.name for b in record.brands]
+            selected_brand = st.selectbox("Select Brand to Edit", [""] + brand_names)
+            
+            if selected_brand:
+                st.info(f"Editing data for {selected_brand} (Organization: {selected_org})")
+                
+                # Find the specific brand data
+                brand_data_entry = record.get_brand(selected_brand)
+                
+                if brand_data_entry:
+                    data = brand_data_entry.data
+                    
+                    # We need to flatten the data or present it in sections for editing
+                    # Since the structure is complex, we can offer specific sections to edit
+                    
+                    edit_options = ["Competitor Analysis", "Google Trends", "Web Traffic", "Social Listening", "Platform Access"]
+                    section_to_edit = st.selectbox("Select Section to Edit", edit_options)
+                    
+                    updated = False
+                    
+                    if section_to_edit == "Competitor Analysis":
+                        comp_data = data.competitor_analysis or CompetitorAnalysis()
+                        
+                        st.subheader("Brand Socials")
+                        # Edit Brand Socials using text inputs (boxes)
+                        socials = comp_data.brand_socials
+                        new_socials = {}
+                        
+                        col_s1, col_s2 = st.columns(2)
+                        for i, platform in enumerate(PLATFORMS):
+                            current_val = socials.get(platform, "")
+                            with (col_s1 if i % 2 == 0 else col_s2):
+                                new_socials[platform] = st.text_input(f"{platform.capitalize()}", value=current_val, key=f"edit_brand_{platform}")
+                        
+                        st.subheader("Competitors")
+                        # Edit Competitors
+                        competitors = comp_data.competitors
+                        # Flatten for editor
+                        flat_comps = []
+                        for c in competitors:
+                            row = {"name": c.name}
+                            row.update(c.socials)
+                            flat_comps.append(row)
+                        
+                        comps_df = pd.DataFrame(flat_comps)
+                        st.info("Edit Competitor details in the table below. Add new rows for new competitors.")
+                        edited_comps = st.data_editor(comps_df, key="edit_competitors", num_rows="dynamic", use_container_width=True)
+                        
+                        if st.button("Save Competitor Analysis Changes"):
+                            # Reconstruct data
+                            new_comps = []
+                            for index, row in edited_comps.iterrows():
+                                if row.get("name"):
+                                    c_data = {"name": row["name"], "socials": {k: v for k, v in row.items() if k != "name"}}
+                                    new_comps.append(Competitor.from_dict(c_data))
+                            
+                            data.competitor_analysis = CompetitorAnalysis(brand_socials=Socials.from_dict(new_socials), competitors=new_comps)
+                            updated = True
+
+                    elif section_to_edit == "Google Trends":
+                        gt_data = data.google_trends or GoogleTrends()
+                        link = st.text_input("Link", value=gt_data.link)
+                        terms = st.text_area("Search Terms", value=gt_data.search_terms)
+                        
+                        if st.button("Save Google Trends Changes"):
+                            data.google_trends = GoogleTrends(link=link, search_terms=terms)
+                            updated = True
+
+                    elif section_to_edit == "Web Traffic":
+                        wt_data = data.web_traffic or WebTraffic()
+                        # Just edit selected competitors list
+                        current_comps = pd.DataFrame(wt_data.selected_competitors, columns=["Competitor"])
+                        edited_wt = st.data_editor(current_comps, key="edit_web_traffic", num_rows="dynamic")
+                        
+                        if st.button("Save Web Traffic Changes"):
+                            data.web_traffic = WebTraffic.from_dict({"selected_competitors": edited_wt["Competitor"].tolist()})
+                            updated = True
+
+                    elif section_to_edit == "Social Listening":
+                        sl_data = data.social_listening or SocialListening()
+                        enabled = st.checkbox("Enabled", value=sl_data.enabled)
+                        
+                        bh_data = sl_data.brand_health or BrandHealth()
+                        
+                        st.subheader("Keywords")
+                        kw_df = pd.DataFrame(bh_data.keywords, columns=["Keyword"])
+                        edited_kw = st.data_editor(kw_df, key="edit_sl_keywords", num_rows="dynamic")
+                        
+                        st.subheader("Hashtags")
+                        ht_df = pd.DataFrame(bh_data.hashtags, columns=["Hashtag"])
+                        edited_ht = st.data_editor(ht_df, key="edit_sl_hashtags", num_rows="dynamic")
+                        
+                        if st.button("Save Social Listening Changes"):
+                            data.social_listening = SocialListening.from_dict({
+                                "enabled": enabled,
+                                "brand_health": {
+                                    "keywords": edited_kw["Keyword"].tolist(),
+                                    "hashtags": edited_ht["Hashtag"].tolist()
+                                }
+                            })
+                            updated = True
+                    
+                    elif section_to_edit == "Platform Access":
+                        # Simple text areas for each platform
+                        new_platform_data = {}
+                        for p in PLATFORM_ACCESS_KEYS:
+                            val = getattr(data, p) or ""
+                            new_val = st.text_area(f"{p.replace('_', ' ').title()}", value=val, key=f"edit_{p}")
+                            new_platform_data[p] = new_val
+                        
+                        if st.button("Save Platform Access Changes"):
+                            for p, v in new_platform_data.items():
+                                setattr(data, p, v)
+                            updated = True
+
+                    if updated:
+                        if data_manager.update_client_record(record):
+                            st.success("Data updated successfully!")
+                            st.rerun()
+                        else:
+                            st.error(CONFLICT_MESSAGE)
+                    
+                    st.markdown("---")
+                    col1, col2 = st.columns(2)
+                    with col2:
+                        if st.button("Delete Brand", type="primary"):
+                            record.brands = [b for b in record.brands if b.name != selected_brand]
+                            if data_manager.update_client_record(record):
+                                st.success(f"Brand {selected_brand} deleted.")
+                                st.rerun()
+                            else:
+                                st.error(CONFLICT_MESSAGE)
+
+            st.markdown("---")
+            if st.button("Delete Entire Organization Record", type="primary"):
+                data_manager.delete_client_record(record.id)
+                st.success(f"Organization {selected_org} deleted.")
+                st.rerun()
+
+            # Version History
+            st.markdown("---")
+            with st.expander("Version History"):
+                versions = data_manager.list_versions(record.id)
+                if versions:
+                    st.table(pd.DataFrame(versions))
+                    version_numbers = [v["version"] for v in versions]
+
+                    col_v1, col_v2 = st.columns(2)
+                    with col_v1:
+                        version_a = st.selectbox("Compare from version", version_numbers, key="history_from")
+                    with col_v2:
+                        version_b = st.selectbox("to version", version_numbers, index=len(version_numbers) - 1, key="history_to")
+
+                    changes = data_manager.diff_versions(record.id, version_a, version_b)
+                    if changes:
+                        st.dataframe(pd.DataFrame([{k: str(v) for k, v in c.items()} for c in changes]), use_container_width=True)
+                    else:
+                        st.info("No differences between the selected versions.")
+
+                    restore_to = st.selectbox("Restore version", version_numbers, key="history_restore")
+                    if st.button("Restore Selected Version"):
+                        if data_manager.restore_version(record.id, restore_to, expected_version=record.version or 1):
+                            st.success(f"Restored version {restore_to} of {selected_org}.")
+                            st.rerun()
+                        else:
+                            st.error(CONFLICT_MESSAGE)
+                else:
+                    st.info("No history recorded for this organization yet.")
+
+            # Excel Export for the managed client
+            st.markdown("---")
+            excel_data = generate_excel(record)
+            st.download_button(
+                label="Download Client Data (Excel)",
+                data=excel_data,
+                file_name=f"{selected_org}_data.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                key="manage_download"
+            )
@@ -0,0 +1,102 @@
+import streamlit as st
+from utils import data_manager, ui_components
+from utils.excel_export import generate_excel
+
+def render():
+    st.header("Onboard New Client")
+    
+    # 1. Data Entry Executive Name (Compulsory)
+    executive_name = st.text_input("Data Entry Executive Name *", key="onboard_exec_name")
+    
+    if executive_name:
+        st.success(f"Executive: {executive_name}")
+        
+        # 2. Organization Name & Brands
+        org_name, brands = ui_components.render_brand_input("onboard")
+        
+        if org_name:
+            st.info(f"Organization: {org_name}")
+            
+            if brands and any(b.strip() for b in brands):
+                st.write(f"**Brands**: {', '.join([b for b in brands if b.strip()])}")
+                
+                report_options = [
+                    "Competitor Analysis", "Google Trends", "Web Traffic", 
+                    "Social Listening", "Meta Platform", "Google Analytics", 
+                    "Meta Campaigns", "Google Ads"
+                ]
+                selected_reports = st.multiselect("Select Reports", report_options)
+                
+                # Container for all brand data
+                all_brand_data = {}
+        
+                for brand in brands:
+                    if not brand.strip():
+                        continue
+                        
+                    st.markdown(f"---")
+                    st.subheader(f"Details for Brand: {brand}")
+                    brand_data = {}
+                    
+                    # Competitor Analysis
+                    if "Competitor Analysis" in selected_reports:
+                        brand_data["competitor_analysis"] = ui_components.render_competitor_analysis_form(brand, f"onboard_{brand}")
+                        if brand_data["competitor_analysis"]:
+                            with st.expander(f"View Entered Competitor Data for {brand}"):
+                                st.json(brand_data["competitor_analysis"])
+                    
+                    competitors = brand_data.get("competitor_analysis", {}).get("competitors", [])
+
+                    if "Google Trends" in selected_reports:
+                        brand_data["google_trends"] = ui_components.render_google_trends_form(brand, f"onboard_{brand}")
+                        
+                    if "Web Traffic" in selected_reports:
+                        brand_data["web_traffic"] = ui_components.render_web_traffic_form(brand, competitors, f"onboard_{brand}")
+                        
+                    if "Social Listening" in selected_reports:
+                        brand_data["social_listening"] = ui_components.render_social_listening_form(brand, competitors, f"onboard_{brand}")
+                        
+                    if "Meta Platform" in selected_reports:
+                        brand_data["meta_platform"] = ui_components.render_platform_access_form(brand, "Meta Platform", f"onboard_{brand}")
+                        
+                    if "Google Analytics" in selected_reports:
+                        brand_data["google_analytics"] = ui_components.render_platform_access_form(brand, "Google Analytics", f"onboard_{brand}")
+                        
+                    if "Meta Campaigns" in selected_reports:
+                        brand_data["meta_campaigns"] = ui_components.render_platform_access_form(brand, "Meta Campaigns", f"onboard_{brand}")
+                        
+                    if "Google Ads" in selected_reports:
+                        brand_data["google_ads"] = ui_components.render_platform_access_form(brand, "Google Ads", f"onboard_{brand}")
+
+                    all_brand_data[brand] = brand_data
+
+                onboard_date = st.date_input("Client Onboard Date")
+                
+                if st.button("Save Data", type="primary"):
+                    client_record = {
+                        "executive_name": executive_name,
+                        "organization": org_name,
+                        "brands": [{"name": b, "data": all_brand_data.get(b, {})} for b in brands if b.strip()],
+                        "reports": selected_reports,
+                        "onboard_date": str(onboard_date),
+                        "type": "onboard"
+                    }
+                    
+                    saved_record = data_manager.add_client_record(client_record)
+                    st.success("Client Onboarded Successfully!")
+                    st.json(saved_record.to_dict())
+                    
+                    excel_data = generate_excel(saved_record)
+                    st.download_button(
+                        label="Download Excel",
+                        data=excel_data,
+                        file_name=f"{org_name}_onboard.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        key="onboard_download"
+                    )
+            else:
+                st.warning("Please add at least one Brand to proceed.")
+        else:
+            st.warning("Please enter Organization Name to proceed.")
+    else:
+        st.warning("Please enter Data Entry Executive Name to start.")
@@ -0,0 +1,79 @@
+import streamlit as st
+from utils import data_manager, ui_components
+from utils.excel_export import generate_excel
+
+def render():
+    st.header("Pitch New Client")
+    
+    # 1. Data Entry Executive Name (Compulsory)
+    executive_name = st.text_input("Data Entry Executive Name *", key="pitch_exec_name")
+    
+    if executive_name:
+        st.success(f"Executive: {executive_name}")
+        
+        # 2. Organization & Brands
+        org_name, brands = ui_components.render_brand_input("pitch")
+        
+        if org_name:
+            st.info(f"Organization: {org_name}")
+            
+            if brands and any(b.strip() for b in brands):
+                st.write(f"**Brands**: {', '.join([b for b in brands if b.strip()])}")
+                
+                presentation_date = st.date_input("Client Presentation Date")
+                
+                # Restricted reports for Pitch
+                report_options = ["Competitor Analysis", "Social Listening"]
+                selected_reports = st.multiselect("Select Reports", report_options, key="pitch_reports")
+                
+                all_brand_data = {}
+        
+                for brand in brands:
+                    if not brand.strip():
+                        continue
+                        
+                    st.markdown(f"---")
+                    st.subheader(f"Details for Brand: {brand}")
+                    brand_data = {}
+                    
+                    if "Competitor Analysis" in selected_reports:
+                        brand_data["competitor_analysis"] = ui_components.render_competitor_analysis_form(brand, f"pitch_{brand}")
+                        if brand_data["competitor_analysis"]:
+                            with st.expander(f"View Entered Competitor Data for {brand}"):
+                                st.json(brand_data["competitor_analysis"])
+                    
+                    competitors = brand_data.get("competitor_analysis", {}).get("competitors", [])
+
+                    if "Social Listening" in selected_reports:
+                        brand_data["social_listening"] = ui_components.render_social_listening_form(brand, competitors, f"pitch_{brand}")
+
+                    all_brand_data[brand] = brand_data
+
+                if st.button("Save Pitch Data", type="primary"):
+                    client_record = {
+                        "executive_name": executive_name,
+                        "organization": org_name,
+                        "brands": [{"name": b, "data": all_brand_data.get(b, {})} for b in brands if b.strip()],
+                        "reports": selected_reports,
+                        "presentation_date": str(presentation_date),
+                        "type": "pitch"
+                    }
+                    
+                    saved_record = data_manager.add_client_record(client_record)
+                    st.success("Pitch Data Saved Successfully!")
+                    st.json(saved_record.to_dict())
+                    
+                    excel_data = generate_excel(saved_record)
+                    st.download_button(
+                        label="Download Excel",
+                        data=excel_data,
+                        file_name=f"{org_name}_pitch.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        key="pitch_download"
+                    )
+            else:
+                st.warning("Please add at least one Brand to proceed.")
+        else:
+            st.warning("Please enter Organization Name to proceed.")
+    else:
+        st.warning("Please enter Data Entry Executive Name to start.")
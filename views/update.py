@@ -0,0 +1,117 @@
+import streamlit as st
+from utils import data_manager, ui_components
+from utils.excel_export import generate_excel
+from utils.models import Brand, BrandData
+
+def render():
+    st.header("Update Existing Client (Add Brand)")
+    
+    selected_org = ui_components.render_organization_picker("update")
+    
+    if selected_org:
+        st.subheader(f"Add New Brand to {selected_org}")
+        
+        # Reuse brand input logic but we only need brands, not org name
+        # We can manually implement the brand list input here for simplicity or modify ui_components
+        # Let's implement a simple version here since we know the org
+        
+        if "update_brands" not in st.session_state:
+            st.session_state["update_brands"] = [""]
+            
+        brands = st.session_state["update_brands"]
+        
+        for i, brand in enumerate(brands):
+            col_b1, col_b2 = st.columns([4, 1])
+            with col_b1:
+                brands[i] = st.text_input(f"New Brand {i+1}", value=brand, key=f"update_brand_{i}")
+            with col_b2:
+                if i > 0:
+                    if st.button("🗑️", key=f"update_del_brand_{i}"):
+                        brands.pop(i)
+                        st.rerun()
+
+        if st.button("Add Another Brand", key="update_add_brand"):
+            brands.append("")
+            st.rerun()
+        
+        valid_brands = [b for b in brands if b.strip()]
+        
+        report_options = [
+            "Competitor Analysis", "Google Trends", "Web Traffic", 
+            "Social Listening", "Meta Platform", "Google Analytics", 
+            "Meta Campaigns", "Google Ads"
+        ]
+        selected_reports = st.multiselect("Select Reports", report_options, key="update_reports")
+        
+        all_brand_data = {}
+        
+        if valid_brands:
+            for brand in valid_brands:
+                st.markdown(f"---")
+                st.subheader(f"Details for Brand: {brand}")
+                brand_data = {}
+                
+                if "Competitor Analysis" in selected_reports:
+                    brand_data["competitor_analysis"] = ui_components.render_competitor_analysis_form(brand, f"update_{brand}")
+                
+                competitors = brand_data.get("competitor_analysis", {}).get("competitors", [])
+
+                if "Google Trends" in selected_reports:
+                    brand_data["google_trends"] = ui_components.render_google_trends_form(brand, f"update_{brand}")
+                    
+                if "Web Traffic" in selected_reports:
+                    brand_data["web_traffic"] = ui_components.render_web_traffic_form(brand, competitors, f"update_{brand}")
+                    
+                if "Social Listening" in selected_reports:
+                    brand_data["social_listening"] = ui_components.render_social_listening_form(brand, competitors, f"update_{brand}")
+                    
+                if "Meta Platform" in selected_reports:
+                    brand_data["meta_platform"] = ui_components.render_platform_access_form(brand, "Meta Platform", f"update_{brand}")
+                    
+                if "Google Analytics" in selected_reports:
+                    brand_data["google_analytics"] = ui_components.render_platform_access_form(brand, "Google Analytics", f"update_{brand}")
+                    
+                if "Meta Campaigns" in selected_reports:
+                    brand_data["meta_campaigns"] = ui_components.render_platform_access_form(brand, "Meta Campaigns", f"update_{brand}")
+                    
+                if "Google Ads" in selected_reports:
+                    brand_data["google_ads"] = ui_components.render_platform_access_form(brand, "Google Ads", f"update_{brand}")
+
+                all_brand_data[brand] = brand_data
+
+        if st.button("Save New Brands", type="primary", key="update_save"):
+            if not valid_brands:
+                st.error("Please add at least one brand.")
+            else:
+                record = data_manager.get_record_by_org(selected_org)
+                if record:
+                    for brand, data in all_brand_data.items():
+                        record.brands.append(Brand(name=brand, data=BrandData.from_dict(data)))
+                    if not data_manager.update_client_record(record):
+                        st.error("Someone else saved this organization at the same moment, so the new brands "
+                                 "were not added. Click Save New Brands again.")
+                        return
+                    st.success(f"Added {len(valid_brands)} brands to {selected_org}!")
+                    
+                    # Display updated data in table
+                    import pandas as pd
+                    st.subheader("Updated Client Data")
+                    flat_data = []
+                    for b in record.brands:
+                        flat_data.append({
+                            "Brand": b.name,
+                            "Reports": ", ".join(selected_reports) if b.name in valid_brands else "Existing"
+                        })
+                    st.table(pd.DataFrame(flat_data))
+                    
+                    # Excel Export
+                    excel_data = generate_excel(record)
+                    st.download_button(
+                        label="Download Excel",
+                        data=excel_data,
+                        file_name=f"{selected_org}_updated.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        key="update_download"
+                    )
+                else:
+                    st.error("Organization record not found.")